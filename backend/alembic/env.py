@@ -0,0 +1,36 @@
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import pool
+
+from app.database import create_db_engine, normalize_database_url
+from app.models.product import Base
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+def run_migrations_offline():
+    """Emit the migration SQL without connecting (alembic upgrade --sql)"""
+    context.configure(url=normalize_database_url(), target_metadata=target_metadata, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    # Migrations use one connection and then exit, so skip pooling
+    engine = create_db_engine(poolclass=pool.NullPool)
+    with engine.connect() as connection:
+        # SQLite cannot ALTER constraints in place; batch mode rebuilds the table
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite"
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
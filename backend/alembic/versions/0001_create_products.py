@@ -0,0 +1,44 @@
+"""create products table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Databases created before Alembic was introduced already have this table
+(from Base.metadata.create_all), so the revision only creates it when missing.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if sa.inspect(op.get_bind()).has_table("products"):
+        return
+
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(500), nullable=False),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("features", sa.JSON(), nullable=True),
+        sa.Column("image_url", sa.String(1000), nullable=True),
+        sa.Column("category", sa.String(200), nullable=True),
+        sa.Column("brand", sa.String(200), nullable=True),
+        sa.Column("availability", sa.String(100), nullable=True),
+        sa.Column("product_url", sa.String(1000), nullable=True),
+        sa.Column("additional_attributes", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+
+
+def downgrade():
+    op.drop_table("products")
@@ -0,0 +1,53 @@
+"""product indexes and unique product_url
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+
+Indexes the hot lookups (title, category, price) and makes product_url the
+natural key of a product. On Postgres, category ILIKE '%...%' gets a pg_trgm
+GIN index. Indexes that already exist (e.g. on a fresh database built by
+create_all) are skipped.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    existing = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("products")}
+    if "ix_products_product_url" not in existing:
+        # Keep the URL on the oldest row only, so the unique index can be built
+        # without deleting anything
+        op.execute(
+            "UPDATE products SET product_url = NULL "
+            "WHERE product_url IS NOT NULL AND id NOT IN ("
+            "SELECT MIN(id) FROM products WHERE product_url IS NOT NULL GROUP BY product_url)"
+        )
+        op.create_index("ix_products_product_url", "products", ["product_url"], unique=True)
+
+    for column in ("title", "category", "price"):
+        op.create_index(f"ix_products_{column}", "products", [column], if_not_exists=True)
+
+    op.create_index("ix_products_category_lower", "products", [sa.text("lower(category)")], if_not_exists=True)
+
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_products_category_trgm "
+            "ON products USING gin (category gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_products_category_trgm")
+    op.drop_index("ix_products_category_lower", table_name="products")
+    for column in ("price", "category", "title"):
+        op.drop_index(f"ix_products_{column}", table_name="products")
+    op.drop_index("ix_products_product_url", table_name="products")
@@ -1,3 +1,9 @@
-from .main import app
+__all__ = ["app"]
 
-__all__ = ["app"]
\ No newline at end of file
+def __getattr__(name):
+    # Imported on first use, so subpackages (such as the scraper's spawned
+    # parse workers) can be imported without building the whole API
+    if name == "app":
+        from .main import app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
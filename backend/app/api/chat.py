@@ -1,29 +1,63 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
-from ..services.vector_service import VectorService
-from ..services.llm_service import LLMService
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Optional
+from ..services.vector_service import VectorService, get_vector_service
+from ..services.query_parser import SearchFilters, parse_query
+from ..services.llm_service import LLMService, get_llm_service
+from ..services.concurrency import run_in_stage
+import json
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-# Initialize services
-vector_service = VectorService()
-llm_service = LLMService()
-
 class ChatMessage(BaseModel):
     message: str
 
+# Upper bound on results per query, for single and batch searches
+MAX_SEARCH_LIMIT = 100
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    limit: int = Field(default=10, ge=1, le=MAX_SEARCH_LIMIT)
+    # Applied to every query, on top of the constraints stated in each one
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    category: Optional[str] = None
+    brand: Optional[str] = None
+    availability: Optional[str] = None
+
+# Upper bound on queries per batch search request, so one call cannot hold the search pool for long
+MAX_BATCH_QUERIES = 1000
+
 class ChatResponse(BaseModel):
     response_type: str
     message: str
     products: List[Dict[str, Any]] = []
     clarifying_questions: List[str] = []
 
+def _no_results_response() -> ChatResponse:
+    return ChatResponse(
+        response_type="no_results",
+        message="I'm sorry, I couldn't find any products matching your query. Could you try describing what you're looking for in a different way?",
+        products=[],
+        clarifying_questions=["What type of furniture are you looking for?", "What room is this for?"]
+    )
+
+def _to_chat_response(llm_response: Dict[str, Any]) -> ChatResponse:
+    return ChatResponse(
+        response_type=llm_response.get("response_type", "recommendation"),
+        message=llm_response.get("message", ""),
+        products=llm_response.get("products", []),
+        clarifying_questions=llm_response.get("clarifying_questions", [])
+    )
+
 @router.post("/", response_model=ChatResponse)
-async def chat_with_assistant(chat_message: ChatMessage):
+async def chat_with_assistant(chat_message: ChatMessage,
+                              vector_service: VectorService = Depends(get_vector_service),
+                              llm_service: LLMService = Depends(get_llm_service)):
     """Chat with the AI assistant for product recommendations"""
     try:
         user_query = chat_message.message.strip()
@@ -31,37 +65,132 @@ async def chat_with_assistant(chat_message: ChatMessage):
         if not user_query:
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
-        # Search for relevant products using vector similarity
-        relevant_products = vector_service.search_products(user_query, n_results=8)
+        # Search for relevant products, with any price/category constraints in the
+        # query applied inside the search. Encoding and the Chroma query are
+        # blocking, so they run on the bounded "search" pool.
+        relevant_products = await run_in_stage("search", _filtered_search, vector_service, user_query, 8)
         
         if not relevant_products:
-            return ChatResponse(
-                response_type="no_results",
-                message="I'm sorry, I couldn't find any products matching your query. Could you try describing what you're looking for in a different way?",
-                products=[],
-                clarifying_questions=["What type of furniture are you looking for?", "What room is this for?"]
-            )
+            return _no_results_response()
         
-        # Use LLM to interpret query and provide recommendations
-        llm_response = llm_service.interpret_query_and_recommend(user_query, relevant_products)
+        # Use LLM to interpret query and provide recommendations (native async client)
+        llm_response = await llm_service.interpret_query_and_recommend(user_query, relevant_products)
         
-        return ChatResponse(
-            response_type=llm_response.get("response_type", "recommendation"),
-            message=llm_response.get("message", ""),
-            products=llm_response.get("products", []),
-            clarifying_questions=llm_response.get("clarifying_questions", [])
-        )
+        return _to_chat_response(llm_response)
         
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+def _filtered_search(vector_service: VectorService, query: str, n_results: int,
+                     explicit_filters: Optional[SearchFilters] = None) -> List[Dict[str, Any]]:
+    """Search with the price/category/brand/availability constraints stated in the query.
+
+    Explicit filters take precedence over parsed ones. Blocking, so it runs on
+    the "search" stage like search_products itself.
+    """
+    search_text, filters = parse_query(query, **vector_service.facets())
+    if explicit_filters is not None:
+        filters = filters.combine(explicit_filters)
+    return vector_service.search_products(search_text, n_results=n_results, filters=filters)
+
+def _filtered_search_many(vector_service: VectorService, queries: List[str], n_results: int,
+                          explicit_filters: Optional[SearchFilters] = None) -> List[List[Dict[str, Any]]]:
+    """Batch form of _filtered_search: every query is parsed, then all are searched in one call"""
+    facets = vector_service.facets()
+    texts, filters = [], []
+    for query in queries:
+        search_text, query_filters = parse_query(query, **facets)
+        if explicit_filters is not None:
+            query_filters = query_filters.combine(explicit_filters)
+        texts.append(search_text)
+        filters.append(query_filters)
+    return vector_service.search_many(texts, n_results=n_results, filters=filters)
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/stream")
+async def chat_with_assistant_stream(chat_message: ChatMessage,
+                                     vector_service: VectorService = Depends(get_vector_service),
+                                     llm_service: LLMService = Depends(get_llm_service)):
+    """Streaming variant of the chat endpoint over Server-Sent Events.
+
+    Frames, in order: "products" (the retrieved candidates, sent as soon as the
+    vector search finishes), any number of "token" frames with the assistant
+    message as it is generated, and a final "done" frame with the same body as
+    POST /api/chat/.
+    """
+    user_query = chat_message.message.strip()
+    if not user_query:
+        raise HTTPException(status_code=400, detail="Message cannot be empty")
+    
+    async def event_stream():
+        try:
+            relevant_products = await run_in_stage("search", _filtered_search, vector_service, user_query, 8)
+            yield _sse_event("products", {"products": relevant_products})
+            
+            if not relevant_products:
+                yield _sse_event("done", _no_results_response().model_dump())
+                return
+            
+            async for event, payload in llm_service.stream_recommendation(user_query, relevant_products):
+                if event == "token":
+                    yield _sse_event("token", {"text": payload})
+                else:
+                    yield _sse_event("done", _to_chat_response(payload).model_dump())
+        
+        except Exception as e:
+            logger.error(f"Error in chat stream: {e}")
+            yield _sse_event("error", {"detail": "Internal server error"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # Disable proxy buffering (nginx) so frames reach the client immediately
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.get("/search/{query}")
-async def search_products(query: str, limit: int = 10):
-    """Search products by query using vector similarity"""
+async def search_products(query: str, limit: int = Query(10, ge=1, le=MAX_SEARCH_LIMIT), min_price: Optional[float] = None, max_price: Optional[float] = None,
+                          category: Optional[str] = None, brand: Optional[str] = None, availability: Optional[str] = None,
+                          vector_service: VectorService = Depends(get_vector_service)):
+    """Search products by query using vector similarity.
+
+    Price, category, brand and availability filters may be given as query
+    parameters or stated in the query itself ("sofa under 10000"); they are
+    applied inside the vector search rather than to its results.
+    """
     try:
-        products = vector_service.search_products(query, n_results=limit)
+        explicit_filters = SearchFilters.create(min_price, max_price, category, brand, availability)
+        products = await run_in_stage("search", _filtered_search, vector_service, query, limit, explicit_filters)
         return {"products": products}
     except Exception as e:
         logger.error(f"Error in search endpoint: {e}")
-        raise HTTPException(status_code=500, detail="Internal server error")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Internal server error")
+
+@router.post("/search/batch")
+async def search_products_batch(request: BatchSearchRequest,
+                                vector_service: VectorService = Depends(get_vector_service)):
+    """Search for many queries in one call, for batch jobs.
+
+    Results are returned in request order as ``{"query", "products"}`` items.
+    All queries are embedded in one forward pass and ranked together, which
+    is much faster than one GET /search/{query} call per query.
+    """
+    queries = [query.strip() for query in request.queries]
+    if not queries or not all(queries):
+        raise HTTPException(status_code=400, detail="Queries must be a non-empty list of non-empty strings")
+    if len(queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUERIES} queries per request")
+    
+    try:
+        explicit_filters = SearchFilters.create(
+            request.min_price, request.max_price, request.category, request.brand, request.availability
+        )
+        results = await run_in_stage("search", _filtered_search_many, vector_service, queries, request.limit, explicit_filters)
+        return {"results": [{"query": query, "products": products} for query, products in zip(queries, results)]}
+    except Exception as e:
+        logger.error(f"Error in batch search endpoint: {e}")
+        raise HTTPException(status_code=500, detail="Internal server error")
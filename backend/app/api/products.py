@@ -1,63 +1,122 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional, Tuple, Dict
+import base64
 import json
-from pathlib import Path
 from ..database import get_db
 from ..models.product import Product
+from ..services.catalog_cache import etag_matches, get_catalog_cache
+from ..services.fallback_catalog import get_fallback_catalog
 
 router = APIRouter()
 
-def load_fallback_products():
-    """Load products from fallback JSON file."""
-    json_path = Path(__file__).parent.parent.parent / "sample_data" / "products_fallback.json"
+# Endpoints are plain "def" because the SQLAlchemy session is blocking;
+# FastAPI runs them in its thread pool instead of on the event loop
+
+def _encode_cursor(last_id: int) -> str:
+    """Opaque pagination cursor pointing just after ``last_id``"""
+    return base64.urlsafe_b64encode(json.dumps({"id": last_id}).encode()).decode().rstrip("=")
+
+def _decode_cursor(cursor: str) -> int:
     try:
-        with open(json_path, 'r') as f:
-            return json.load(f)
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
     except Exception:
-        return []
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _cached_json(request: Request, entry: Tuple[bytes, str, Dict[str, str]]) -> Response:
+    """Serve a pre-serialized body, or 304 when the client already has it"""
+    body, etag, headers = entry
+    # no-cache: clients and CDNs may store the response but must revalidate
+    headers = dict(headers, ETag=etag, **{"Cache-Control": "no-cache"})
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/", response_model=List[dict])
-async def get_all_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all products with pagination. Falls back to JSON if DB unavailable."""
+def get_all_products(request: Request, response: Response, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                     db: Session = Depends(get_db)):
+    """Get all products with pagination. Falls back to JSON if DB unavailable.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to get the
+    next page. Cursor pages seek on the id index, so every page costs the same
+    however deep it is; ``skip`` still works but scans the skipped rows.
+    Database pages are served pre-serialized with a strong ETag.
+    """
+    after_id = _decode_cursor(cursor) if cursor else None
+    
+    def build_page():
+        query = db.query(Product).order_by(Product.id)
+        if after_id is not None:
+            query = query.filter(Product.id > after_id)
+        else:
+            query = query.offset(skip)
+        # One extra row tells whether there is a next page
+        products = query.limit(limit + 1).all()
+        if not products and (after_id is None or db.query(Product.id).first() is None):
+            return None
+        headers = {}
+        if len(products) > limit:
+            products = products[:limit]
+            headers["X-Next-Cursor"] = _encode_cursor(products[-1].id)
+        return [product.to_dict() for product in products], headers
+    
     try:
-        products = db.query(Product).offset(skip).limit(limit).all()
-        if products:
-            return [product.to_dict() for product in products]
-        # If DB is empty, return fallback data
-        return load_fallback_products()[skip:skip+limit]
+        page_key = ("page", after_id, skip if after_id is None else 0, limit)
+        entry = get_catalog_cache().get_or_build(db, page_key, build_page)
+        if entry is not None:
+            return _cached_json(request, entry)
     except Exception:
         # If DB connection fails, return fallback data
-        return load_fallback_products()[skip:skip+limit]
+        pass
+    
+    # If DB is empty or unavailable, return fallback data (held in memory)
+    fallback = get_fallback_catalog()
+    if after_id is not None:
+        page = fallback.products_after(after_id, limit + 1)
+    else:
+        page = fallback.products()[skip:skip + limit + 1]
+    if len(page) > limit:
+        page = page[:limit]
+        if page[-1].get('id') is not None:
+            response.headers["X-Next-Cursor"] = _encode_cursor(page[-1]['id'])
+    return page
 
 @router.get("/{product_id}", response_model=dict)
-async def get_product(product_id: int, db: Session = Depends(get_db)):
+def get_product(product_id: int, request: Request, db: Session = Depends(get_db)):
     """Get a specific product by ID. Falls back to JSON if DB unavailable."""
-    try:
+    def build_product():
         product = db.query(Product).filter(Product.id == product_id).first()
-        if product:
-            return product.to_dict()
-    except Exception:
-@router.get("/category/{category}")
-async def get_products_by_category(category: str, db: Session = Depends(get_db)):
-    """Get products by category. Falls back to JSON if DB unavailable."""
+        return (product.to_dict(), {}) if product else None
+    
     try:
-        products = db.query(Product).filter(Product.category.ilike(f"%{category}%")).all()
-        if products:
-            return [product.to_dict() for product in products]
+        entry = get_catalog_cache().get_or_build(db, ("product", product_id), build_product)
+        if entry is not None:
+            return _cached_json(request, entry)
     except Exception:
         pass
     
     # Fallback to JSON data
-    fallback_products = load_fallback_products()
-    return [p for p in fallback_products if category.lower() in p.get('category', '').lower()]
-        if p.get('id') == product_id:
-            return p
+    product = get_fallback_catalog().get(product_id)
+    if product:
+        return product
     
     raise HTTPException(status_code=404, detail="Product not found")
 
 @router.get("/category/{category}")
-async def get_products_by_category(category: str, db: Session = Depends(get_db)):
-    """Get products by category"""
-    products = db.query(Product).filter(Product.category.ilike(f"%{category}%")).all()
-    return [product.to_dict() for product in products]
\ No newline at end of file
+def get_products_by_category(category: str, request: Request, db: Session = Depends(get_db)):
+    """Get products by category. Falls back to JSON if DB unavailable."""
+    def build_category():
+        products = db.query(Product).filter(Product.category.ilike(f"%{category}%")).all()
+        return ([product.to_dict() for product in products], {}) if products else None
+    
+    try:
+        # ILIKE is case-insensitive, so is the cache key
+        entry = get_catalog_cache().get_or_build(db, ("category", category.lower()), build_category)
+        if entry is not None:
+            return _cached_json(request, entry)
+    except Exception:
+        pass
+    
+    # Fallback to JSON data
+    return get_fallback_catalog().by_category(category)
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from pydantic import BaseModel
 from ..scraper.furlenco_scraper import FurlencoScraper, get_fallback_furlenco_products
-from ..services.vector_service import VectorService
+from ..scraper.selector_plan import get_selector_plan
+from ..services.vector_service import VectorService, get_vector_service
+from ..services.catalog_sync import sync_vector_index, reconcile_vector_index
+from ..services.product_ingest import bulk_upsert_products
 from ..models.product import Product
 from ..database import SessionLocal
 import logging
@@ -24,6 +27,7 @@ def scrape_and_store_products(max_products: int = 30, use_fallback: bool = False
     """Scrape products and store them in database and vector store"""
     try:
         logger.info("Starting product scraping...")
+        crawl_stats = {}
         
         if use_fallback:
             # Use fallback data
@@ -33,49 +37,40 @@ def scrape_and_store_products(max_products: int = 30, use_fallback: bool = False
             # Try to scrape
             scraper = FurlencoScraper()
             products = scraper.scrape_products(max_products)
+            crawl_stats = scraper.last_crawl_stats
             
             # If scraping fails or returns too few products, use fallback
+            # (pages answered with 304 Not Modified still count as scraped)
             if len(products) < 5:
                 logger.warning("Scraping returned few products, using fallback data")
                 products = get_fallback_furlenco_products()
+                crawl_stats = {}
         
         # Store in database
         db = SessionLocal()
         try:
-            stored_count = 0
-            for product_data in products:
-                # Check if product already exists
-                existing_product = db.query(Product).filter(
-                    Product.title == product_data['title']
-                ).first()
-                
-                if not existing_product:
-                    product = Product(
-                        title=product_data['title'],
-                        price=product_data['price'],
-                        description=product_data['description'],
-                        features=product_data['features'],
-                        image_url=product_data['image_url'],
-                        category=product_data['category'],
-                        brand=product_data['brand'],
-                        availability=product_data['availability'],
-                        product_url=product_data['product_url'],
-                        additional_attributes=product_data['additional_attributes']
-                    )
-                    db.add(product)
-                    stored_count += 1
-                
-                # Update existing product with ID for vector storage
-                if existing_product:
-                    product_data['id'] = existing_product.id
+            # Products are matched on their URL (the natural key): one lookup of
+            # existing URLs, then batched inserts/upserts
+            ingest = bulk_upsert_products(db, products, key="product_url")
+            logger.info(
+                f"Stored {ingest['inserted']} new and {ingest['updated']} updated products in database "
+                f"({ingest['rows_per_sec']:.0f} rows/s)"
+            )
             
-            db.commit()
-            logger.info(f"Stored {stored_count} new products in database")
+            # Nothing to re-embed when every page came back 304 Not Modified
+            # and no product was stored or changed
+            if ingest["inserted"] == 0 and ingest["updated"] == 0 and products and crawl_stats.get("not_modified") == len(products):
+                logger.info("All scraped pages were unchanged, skipping vector database sync")
+                return
             
-            # Store in vector database
-            vector_service = VectorService()
-            vector_service.add_products(products)
-            logger.info(f"Added {len(products)} products to vector database")
+            # Mirror the SQL catalog into the vector database, keyed by Product.id.
+            # Only new or changed products are re-embedded and vectors for
+            # products that no longer exist in SQL are removed.
+            ingest_stats = sync_vector_index(db, get_vector_service())
+            logger.info(
+                f"Vector database sync: {ingest_stats['embedded']} embedded, "
+                f"{ingest_stats['unchanged']} unchanged, {ingest_stats['deleted']} deleted"
+            )
             
         finally:
             db.close()
@@ -84,7 +79,7 @@ def scrape_and_store_products(max_products: int = 30, use_fallback: bool = False
         logger.error(f"Error in scraping task: {e}")
 
 @router.get("/status")
-async def get_scraping_status():
+def get_scraping_status(vector_service: VectorService = Depends(get_vector_service)):
     """Get current status of product database"""
     try:
         db = SessionLocal()
@@ -93,14 +88,32 @@ async def get_scraping_status():
         finally:
             db.close()
         
-        vector_service = VectorService()
         vector_count = vector_service.get_collection_count()
         
         return {
             "database_products": product_count,
             "vector_products": vector_count,
+            "vector_load_seconds": vector_service.load_seconds,
             "status": "ready" if product_count > 0 else "no_data"
         }
     except Exception as e:
         logger.error(f"Error getting status: {e}")
-        raise HTTPException(status_code=500, detail="Error getting status")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Error getting status")
+
+@router.get("/selectors")
+def get_selector_stats():
+    """Per-template selector hit counts and learned order for product extraction"""
+    return get_selector_plan().stats()
+
+@router.post("/reconcile")
+def reconcile_vectors(dry_run: bool = True, vector_service: VectorService = Depends(get_vector_service)):
+    """Find (and unless dry_run, remove) vectors that no longer match a product in the database"""
+    try:
+        db = SessionLocal()
+        try:
+            return reconcile_vector_index(db, vector_service, dry_run=dry_run)
+        finally:
+            db.close()
+    except Exception as e:
+        logger.error(f"Error reconciling vector index: {e}")
+        raise HTTPException(status_code=500, detail="Error reconciling vector index")
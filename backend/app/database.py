@@ -1,15 +1,117 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import QueuePool
+from collections import deque
+from typing import Any, Dict, Optional
 import os
+import threading
+import time
 from dotenv import load_dotenv
 
 load_dotenv()
 
+DEFAULT_DATABASE_URL = "sqlite:///./neusearch.db"
+
+def normalize_database_url(url: Optional[str] = None) -> str:
+    """DATABASE_URL (or ``url``) in the form SQLAlchemy expects"""
+    url = url or os.getenv("DATABASE_URL") or DEFAULT_DATABASE_URL
+    # Handle Railway/Render postgres:// to postgresql://
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each connection checkout waits"""
+
+    # Recent waits kept for percentiles
+    WAIT_SAMPLES = 1024
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._waits = deque(maxlen=self.WAIT_SAMPLES)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except Exception:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self._waits.append(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            waits = sorted(self._waits)
+            checkouts, timeouts, total_wait, max_wait = self.checkouts, self.timeouts, self.total_wait, self.max_wait
+
+        def percentile(fraction: float) -> float:
+            return waits[min(len(waits) - 1, int(len(waits) * fraction))] * 1000 if waits else 0.0
+
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "checked_in": self.checkedin(),
+            "checkouts": checkouts,
+            "timeouts": timeouts,
+            "wait_ms_avg": total_wait / checkouts * 1000 if checkouts else 0.0,
+            "wait_ms_p50": percentile(0.5),
+            "wait_ms_p99": percentile(0.99),
+            "wait_ms_max": max_wait * 1000
+        }
+
+def create_db_engine(database_url: Optional[str] = None, **overrides) -> Engine:
+    """Create an engine with the pool settings from the environment.
+
+    Every engine in the app (API, seeder, migrations) goes through here so
+    URL normalization and pool settings are applied consistently. Pre-ping
+    replaces connections the server closed while idle, and recycling retires
+    them before provider-side idle timeouts hit.
+    """
+    url = normalize_database_url(database_url)
+    options: Dict[str, Any] = {"pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"}
+
+    # In-memory SQLite lives in a single connection, so it keeps its own pool;
+    # callers may also pass another poolclass (e.g. NullPool for one-off scripts)
+    in_memory = url.startswith("sqlite") and (":memory:" in url or url in ("sqlite://", "sqlite:///"))
+    queue_pool = issubclass(overrides.get("poolclass", InstrumentedQueuePool), QueuePool)
+    if queue_pool and not in_memory:
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800"))
+        )
+
+    options.update(overrides)
+    return create_engine(url, **options)
+
+def get_pool_stats(db_engine: Optional[Engine] = None) -> Dict[str, Any]:
+    """Occupancy and checkout-wait metrics of the engine's connection pool"""
+    pool = (db_engine or engine).pool
+    if isinstance(pool, InstrumentedQueuePool):
+        return pool.stats()
+    return {"pool": type(pool).__name__}
+
 # Database configuration
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./neusearch.db")
+DATABASE_URL = normalize_database_url()
 
-engine = create_engine(DATABASE_URL)
+engine = create_db_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -20,4 +122,4 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -1,9 +1,15 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy import create_engine
-from .database import engine
+from .database import engine, get_pool_stats
 from .models import Base
 from .api import products_router, chat_router, scraping_router
+from .services.vector_service import get_vector_service
+from .services.llm_service import get_llm_service
+from .services.concurrency import get_stage_stats, shutdown_stage_pools
+from .services.catalog_cache import get_catalog_cache
+from starlette.concurrency import run_in_threadpool
+import os
 import logging
 
 # Configure logging
@@ -27,8 +33,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Readable by browser clients for cursor pagination
 )
 
+@app.on_event("startup")
+async def warm_up_vector_service():
+    """Load the embedding model and Chroma client once per worker before serving traffic"""
+    if os.getenv("VECTOR_WARMUP", "true").lower() != "true":
+        return
+    try:
+        load_seconds = await run_in_threadpool(get_vector_service().warm_up)
+        logger.info(f"Vector service warm-up finished in {load_seconds:.2f}s")
+    except Exception as e:
+        # Not fatal: the service will retry loading on first use
+        logger.error(f"Vector service warm-up failed: {e}")
+
+@app.on_event("shutdown")
+async def release_resources():
+    shutdown_stage_pools()
+    await get_llm_service().aclose()
+
 # Include routers
 app.include_router(products_router, prefix="/api/products", tags=["products"])
 app.include_router(chat_router, prefix="/api/chat", tags=["chat"])
@@ -46,6 +70,21 @@ async def health_check():
 async def api_health_check():
     return {"status": "ok"}
 
+@app.get("/api/metrics")
+def metrics():
+    """Cache and concurrency counters for this worker process"""
+    # Plain def: backend stats count vectors (Chroma's SQLite or disk), so
+    # FastAPI runs this on its thread pool instead of the event loop
+    vector_service = get_vector_service()
+    return {
+        "vector_service_loaded": vector_service.is_loaded,
+        "vector_backend": vector_service.get_backend_stats(),
+        "caches": dict(vector_service.get_cache_stats(), catalog_responses=get_catalog_cache().stats()),
+        "stages": get_stage_stats(),
+        "db_pool": get_pool_stats(),
+        "llm": get_llm_service().get_stats()
+    }
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
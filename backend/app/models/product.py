@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON, DDL, Index, event
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from datetime import datetime
@@ -9,19 +9,29 @@ class Product(Base):
     __tablename__ = "products"
     
     id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(500), nullable=False)
-    price = Column(Float, nullable=False)
+    title = Column(String(500), nullable=False, index=True)
+    price = Column(Float, nullable=False, index=True)
     description = Column(Text, nullable=True)
     features = Column(JSON, nullable=True)  # Store features as JSON
     image_url = Column(String(1000), nullable=True)
-    category = Column(String(200), nullable=True)
+    category = Column(String(200), nullable=True, index=True)
     brand = Column(String(200), nullable=True)
     availability = Column(String(100), nullable=True)
-    product_url = Column(String(1000), nullable=True)
+    product_url = Column(String(1000), nullable=True, unique=True, index=True)  # Natural key of scraped products
     additional_attributes = Column(JSON, nullable=True)  # Store any extra attributes
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    __table_args__ = (
+        # Case-insensitive category lookups
+        Index("ix_products_category_lower", func.lower(category)),
+        # Trigram index so category ILIKE '%...%' does not scan the table (Postgres only)
+        Index(
+            "ix_products_category_trgm", category,
+            postgresql_using="gin", postgresql_ops={"category": "gin_trgm_ops"}
+        ).ddl_if(dialect="postgresql"),
+    )
+    
     def to_dict(self):
         return {
             "id": self.id,
@@ -37,4 +47,10 @@ class Product(Base):
             "additional_attributes": self.additional_attributes,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
-        }
\ No newline at end of file
+        }
+
+# The trigram index needs the pg_trgm extension
+event.listen(
+    Product.__table__, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
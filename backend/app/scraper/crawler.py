@@ -0,0 +1,110 @@
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import asyncio
+import logging
+import random
+import time
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Responses worth retrying: throttling and transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+class TokenBucket:
+    """Async token bucket: ``rate`` requests per second with bursts of up to ``capacity``"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Holding the lock while sleeping keeps waiters in FIFO order
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+class AsyncCrawler:
+    """Concurrent HTTP fetcher shared by a whole crawl.
+
+    - one pooled ``httpx.AsyncClient`` for all requests
+    - at most ``max_workers`` requests in flight
+    - a token bucket per host, so politeness limits hold however many workers run
+    - retries with exponential backoff and jitter on transport errors, 429 and 5xx
+      (``Retry-After`` is honoured when the server sends it)
+    """
+
+    def __init__(self, headers: Optional[Dict[str, str]] = None, max_workers: int = 8,
+                 rate_per_host: float = 2.0, burst: int = 4, max_retries: int = 3,
+                 backoff_seconds: float = 0.5, timeout_seconds: float = 15.0):
+        self.max_workers = max_workers
+        self.rate_per_host = rate_per_host
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            timeout=timeout_seconds,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "bytes": 0}
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(self.rate_per_host, self.burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response]) -> float:
+        if response is not None and response.headers.get("Retry-After", "").isdigit():
+            return float(response.headers["Retry-After"])
+        return self.backoff_seconds * (2 ** attempt) * (0.5 + random.random())
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[httpx.Response]:
+        """GET ``url``, returning the final response or None if every attempt failed"""
+        for attempt in range(self.max_retries + 1):
+            # Wait for the host's rate limit before taking a worker slot, so a
+            # throttled host does not hold slots other hosts could use
+            await self._bucket(url).acquire()
+            response = None
+            try:
+                async with self._semaphore:
+                    self.stats["requests"] += 1
+                    response = await self._client.get(url, headers=headers)
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.stats["bytes"] += len(response.content)
+                    return response
+                logger.warning(f"HTTP {response.status_code} for {url} (attempt {attempt + 1})")
+            except httpx.HTTPError as e:
+                logger.warning(f"Error fetching {url} (attempt {attempt + 1}): {e}")
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._retry_delay(attempt, response))
+
+        self.stats["failures"] += 1
+        logger.error(f"Giving up on {url} after {self.max_retries + 1} attempts")
+        return None
+
+    async def aclose(self):
+        await self._client.aclose()
+
+    async def __aenter__(self) -> "AsyncCrawler":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -0,0 +1,94 @@
+from typing import Any, Dict, Optional
+import gzip
+import hashlib
+import json
+import os
+import time
+
+class HttpCache:
+    """On-disk HTTP cache for scraped pages.
+
+    Each URL gets a gzip-compressed body and a JSON metadata file holding the
+    validators (ETag / Last-Modified) used for conditional requests, plus the
+    data extracted from the page, so a 304 response needs no re-parsing.
+    Files are sharded by the first two hex digits of the URL's hash.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], key + suffix)
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the cached metadata for ``url``, or None"""
+        try:
+            with open(self._path(url, ".json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def conditional_headers(meta: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Request headers that let the server answer 304 Not Modified"""
+        meta = meta or {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        try:
+            with gzip.open(self._path(url, ".html.gz"), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def store(self, url: str, body: bytes, headers: Dict[str, str],
+              extracted: Any = None, extraction_version: Optional[int] = None):
+        """Save a freshly downloaded page, its validators and what was extracted from it"""
+        body_path = self._path(url, ".html.gz")
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        self._atomic_write(body_path, gzip.compress(body))
+        self._write_meta(url, {
+            "url": url,
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "fetched_at": time.time(),
+            "size": len(body),
+            "extracted": extracted,
+            "extraction_version": extraction_version
+        })
+
+    def store_extracted(self, url: str, extracted: Any, version: int):
+        """Remember what was extracted from the cached body (and with which extractor version)"""
+        meta = self.get(url)
+        if meta is None:
+            return
+        meta["extracted"] = extracted
+        meta["extraction_version"] = version
+        self._write_meta(url, meta)
+
+    def mark_validated(self, url: str):
+        """Record that the server confirmed the cached copy is still current"""
+        meta = self.get(url)
+        if meta is not None:
+            meta["validated_at"] = time.time()
+            self._write_meta(url, meta)
+
+    def _write_meta(self, url: str, meta: Dict[str, Any]):
+        path = self._path(url, ".json")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._atomic_write(path, json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def _atomic_write(path: str, data: bytes):
+        # Write then rename so a crash never leaves a truncated file behind
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
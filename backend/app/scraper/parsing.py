@@ -0,0 +1,197 @@
+"""HTML extraction for Furlenco pages.
+
+These are plain module-level functions so they can run in a process pool:
+parsing is CPU-bound and would otherwise serialize on the GIL next to the
+crawler's network I/O.
+"""
+import os
+from typing import List, Dict, Any, Optional
+from bs4 import BeautifulSoup
+from bs4.builder import builder_registry
+import re
+import soupsieve as sv
+
+def _default_parser() -> str:
+    # lxml is several times faster than the pure-Python html.parser
+    parser = os.getenv("SCRAPER_HTML_PARSER", "lxml")
+    if builder_registry.lookup(parser) is None:
+        return "html.parser"
+    return parser
+
+DEFAULT_PARSER = _default_parser()
+
+# Bump whenever the extraction below changes, so extractions saved in the
+# scraper's HTTP cache are redone from the cached pages
+EXTRACTION_VERSION = 2
+
+def extract_price(text: str) -> float:
+    """Extract price from text"""
+    if not text:
+        return 0.0
+
+    # Remove common price prefixes and suffixes
+    price_text = re.sub(r'[^\d.,]', '', text)
+    price_text = price_text.replace(',', '')
+
+    try:
+        return float(price_text)
+    except:
+        return 0.0
+
+def parse_listing_html(html, base_url: str, parser: str = DEFAULT_PARSER) -> List[str]:
+    """Extract product URLs from listing page HTML"""
+    soup = BeautifulSoup(html, parser)
+
+    product_links = []
+
+    # Look for product links - adjust selectors based on actual HTML
+    # Common patterns for product links
+    selectors = [
+        'a[href*="/product/"]',
+        'a[href*="/products/"]',
+        '.product-card a',
+        '.product-item a',
+        '[data-testid="product-link"]'
+    ]
+
+    for selector in selectors:
+        links = soup.select(selector)
+        for link in links:
+            href = link.get('href')
+            if href:
+                if href.startswith('/'):
+                    href = base_url + href
+                product_links.append(href)
+        
+        if product_links:
+            break
+
+    # Remove duplicates, keeping page order
+    return list(dict.fromkeys(product_links))
+
+# Fallback selectors for each product field, in their default priority order
+PRODUCT_FIELD_SELECTORS: Dict[str, List[str]] = {
+    "title": ['h1', '.product-title', '[data-testid="product-title"]', '.product-name'],
+    "price": ['.price', '.product-price', '[data-testid="price"]', '.current-price'],
+    "description": ['.product-description', '.description', '[data-testid="description"]'],
+    "features": ['.features li', '.specifications li', '.product-features li'],
+    "image": ['.product-image img', '.main-image img', 'img[data-testid="product-image"]'],
+    "breadcrumbs": ['.breadcrumb a', '.breadcrumbs a', '[data-testid="breadcrumb"] a']
+}
+
+# Fields that use every element a selector matches, not just the first one
+_MULTI_MATCH_FIELDS = {"features", "breadcrumbs"}
+
+# Selectors are compiled once per process instead of on every page
+_COMPILED_SELECTORS = {
+    selector: sv.compile(selector)
+    for selectors in PRODUCT_FIELD_SELECTORS.values()
+    for selector in selectors
+}
+
+# Every product selector as one selector list, for single-pass matching
+_ALL_SELECTORS = sv.compile(", ".join(_COMPILED_SELECTORS))
+
+def _select(soup, field: str, selector: str) -> list:
+    compiled = _COMPILED_SELECTORS[selector]
+    if field in _MULTI_MATCH_FIELDS:
+        return compiled.select(soup)
+    elem = compiled.select_one(soup)
+    return [elem] if elem is not None else []
+
+def _match_all(soup, field_selectors: Dict[str, List[str]]) -> Dict[str, list]:
+    """Evaluate every selector in a single traversal of the document.
+
+    The combined selector list walks the DOM once; only the (few) elements it
+    matches are then checked against the individual selectors.
+    """
+    matches = {selector: [] for selectors in field_selectors.values() for selector in selectors}
+    candidates = [
+        (selector, _COMPILED_SELECTORS[selector], field in _MULTI_MATCH_FIELDS)
+        for field, selectors in field_selectors.items()
+        for selector in selectors
+    ]
+    for tag in _ALL_SELECTORS.select(soup):
+        for selector, compiled, multi in candidates:
+            found = matches[selector]
+            if (multi or not found) and compiled.match(tag):
+                found.append(tag)
+    return matches
+
+def _field_value(field: str, elems: list, base_url: str):
+    """Value of ``field`` from the matched elements, or None if the selector does not qualify"""
+    if not elems:
+        return None
+    if field == "price":
+        return extract_price(elems[0].get_text(strip=True))
+    if field == "features":
+        return [elem.get_text(strip=True) for elem in elems]
+    if field == "image":
+        img_src = elems[0].get('src') or elems[0].get('data-src')
+        if not img_src:
+            return None
+        return base_url + img_src if img_src.startswith('/') else img_src
+    if field == "breadcrumbs":
+        # The category is the breadcrumb before the product itself
+        return elems[-2].get_text(strip=True) if len(elems) > 1 else None
+    return elems[0].get_text(strip=True)
+
+def extract_product(html, product_url: str, base_url: str, parser: str = DEFAULT_PARSER,
+                    selector_order: Optional[Dict[str, List[str]]] = None,
+                    single_pass: bool = False) -> Dict[str, Any]:
+    """Extract a product page and report which selector produced each field.
+
+    ``selector_order`` overrides the order selectors are tried in per field
+    (see ``SelectorPlan``). With ``single_pass`` all selectors are matched in
+    one walk over the DOM instead of one ``select`` call per selector.
+    Returns ``{"product": ..., "selectors": {field: winning selector or None}}``.
+    """
+    soup = BeautifulSoup(html, parser)
+    order = {
+        field: (selector_order or {}).get(field, selectors)
+        for field, selectors in PRODUCT_FIELD_SELECTORS.items()
+    }
+    matches = _match_all(soup, order) if single_pass else None
+
+    values: Dict[str, Any] = {}
+    winners: Dict[str, Optional[str]] = {}
+    for field, selectors in order.items():
+        values[field] = None
+        winners[field] = None
+        for selector in selectors:
+            elems = matches[selector] if matches is not None else _select(soup, field, selector)
+            value = _field_value(field, elems, base_url)
+            if value is not None:
+                values[field] = value
+                winners[field] = selector
+                break
+
+    category = values["breadcrumbs"] or ""
+    if not category:
+        # Extract from URL
+        url_parts = product_url.split('/')
+        if 'categories' in url_parts:
+            try:
+                category_idx = url_parts.index('categories') + 1
+                if category_idx < len(url_parts):
+                    category = url_parts[category_idx].replace('-', ' ').title()
+            except:
+                pass
+
+    product = {
+        "title": values["title"] if values["title"] is not None else "",
+        "price": values["price"] if values["price"] is not None else 0.0,
+        "description": values["description"] if values["description"] is not None else "",
+        "features": values["features"] or [],
+        "image_url": values["image"] or "",
+        "category": category,
+        "brand": "Furlenco",
+        "availability": "Available",
+        "product_url": product_url,
+        "additional_attributes": {}
+    }
+    return {"product": product, "selectors": winners}
+
+def parse_product_html(html, product_url: str, base_url: str, parser: str = DEFAULT_PARSER) -> Dict[str, Any]:
+    """Extract product information from a product page's HTML"""
+    return extract_product(html, product_url, base_url, parser)["product"]
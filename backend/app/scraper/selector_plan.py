@@ -0,0 +1,86 @@
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+import threading
+from .parsing import PRODUCT_FIELD_SELECTORS
+
+def page_template(url: str) -> str:
+    """Template key for a page: its host plus the first path segment (e.g. "furlenco.com/product")"""
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split('/') if segment]
+    return f"{parts.netloc}/{segments[0] if segments else ''}"
+
+class SelectorPlan:
+    """Learned selector order for product extraction, per page template.
+
+    Every parsed page reports which selector produced each field. Selectors
+    that win most often on a template are tried first on its next pages
+    (ties keep the default priority), so a stable site needs one lookup per
+    field. The hit counts double as a view of selector drift.
+    """
+
+    def __init__(self, field_selectors: Dict[str, List[str]] = PRODUCT_FIELD_SELECTORS):
+        self.field_selectors = field_selectors
+        self._lock = threading.Lock()
+        self._templates: Dict[str, Dict[str, Any]] = {}
+
+    def order(self, template: str) -> Dict[str, List[str]]:
+        """Selectors per field, best first, for pages of ``template``"""
+        with self._lock:
+            stats = self._templates.get(template)
+            if stats is None:
+                return {field: list(selectors) for field, selectors in self.field_selectors.items()}
+            return {
+                field: sorted(selectors, key=lambda selector: -stats["hits"][field].get(selector, 0))
+                for field, selectors in self.field_selectors.items()
+            }
+
+    def record(self, template: str, winners: Dict[str, Optional[str]]):
+        """Count the winning selector (or a miss) for each field of one page"""
+        with self._lock:
+            stats = self._templates.get(template)
+            if stats is None:
+                stats = {
+                    "pages": 0,
+                    "hits": {field: {} for field in self.field_selectors},
+                    "misses": {field: 0 for field in self.field_selectors}
+                }
+                self._templates[template] = stats
+
+            stats["pages"] += 1
+            for field in self.field_selectors:
+                selector = winners.get(field)
+                if selector is None:
+                    stats["misses"][field] += 1
+                else:
+                    stats["hits"][field][selector] = stats["hits"][field].get(selector, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            templates = {}
+            for template, stats in self._templates.items():
+                pages = stats["pages"]
+                templates[template] = {
+                    "pages": pages,
+                    "fields": {
+                        field: {
+                            "order": sorted(selectors, key=lambda selector: -stats["hits"][field].get(selector, 0)),
+                            "hits": dict(stats["hits"][field]),
+                            "misses": stats["misses"][field],
+                            "hit_rate": (pages - stats["misses"][field]) / pages if pages else 0.0
+                        }
+                        for field, selectors in self.field_selectors.items()
+                    }
+                }
+        return {"templates": templates}
+
+_selector_plan = None
+_selector_plan_lock = threading.Lock()
+
+def get_selector_plan() -> SelectorPlan:
+    """Return the process-wide SelectorPlan, shared by every crawl"""
+    global _selector_plan
+    if _selector_plan is None:
+        with _selector_plan_lock:
+            if _selector_plan is None:
+                _selector_plan = SelectorPlan()
+    return _selector_plan
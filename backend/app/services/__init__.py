@@ -1,4 +1,4 @@
-from .vector_service import VectorService
-from .llm_service import LLMService
+from .vector_service import VectorService, get_vector_service
+from .llm_service import LLMService, get_llm_service
 
-__all__ = ["VectorService", "LLMService"]
\ No newline at end of file
+__all__ = ["VectorService", "get_vector_service", "LLMService", "get_llm_service"]
\ No newline at end of file
@@ -0,0 +1,124 @@
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from .cache import LRUCache, VersionCounter
+from ..models.product import Product
+
+# Optional orjson import - several times faster than the stdlib encoder
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+def dumps(payload: Any) -> bytes:
+    """Encode ``payload`` as compact JSON bytes"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload, default=str)
+    return json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag: a digest of the exact response bytes"""
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header covers ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag[2:] == etag if tag.startswith("W/") else tag == etag for tag in candidates)
+
+class CatalogResponseCache:
+    """Pre-serialized JSON bodies for the product catalog endpoints.
+
+    Entries are keyed by the catalog version, so a catalog change makes every
+    older entry unreachable. The version combines a cheap SQL fingerprint
+    (row count, highest id, latest update), refreshed at most every
+    ``fingerprint_ttl`` seconds so writes from other processes are picked up,
+    with a local counter bumped by writers in this process.
+    Each entry is ``(body, etag, headers)``.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024, fingerprint_ttl: float = 2.0):
+        self.entries = LRUCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            sizeof=lambda entry: len(entry[0])
+        )
+        self.fingerprint_ttl = fingerprint_ttl
+        self.local_version = VersionCounter()
+        self._fingerprint: Optional[Tuple] = None
+        self._fingerprint_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def version(self, db: Session) -> Tuple:
+        now = time.monotonic()
+        with self._lock:
+            stale = self._fingerprint_at is None or now - self._fingerprint_at >= self.fingerprint_ttl
+        if stale:
+            count, max_id, max_updated = db.query(
+                func.count(Product.id), func.max(Product.id), func.max(Product.updated_at)
+            ).one()
+            with self._lock:
+                self._fingerprint = (count, max_id, str(max_updated))
+                self._fingerprint_at = now
+        return (self.local_version.value, self._fingerprint)
+
+    def invalidate(self):
+        """Called after writes in this process; other processes catch up within fingerprint_ttl"""
+        self.local_version.bump()
+        with self._lock:
+            self._fingerprint_at = None
+        self.entries.clear()
+
+    def get_or_build(self, db: Session, key: Hashable,
+                     build: Callable[[], Optional[Tuple[Any, Dict[str, str]]]]) -> Optional[Tuple[bytes, str, Dict[str, str]]]:
+        """Cached ``(body, etag, headers)`` for ``key``, building it on a miss.
+
+        ``build`` returns ``(payload, headers)``, or None when the result must
+        not be cached (e.g. the catalog is empty and fallback data is served).
+        """
+        cache_key = (self.version(db), key)
+        entry = self.entries.get(cache_key)
+        if entry is not None:
+            return entry
+
+        built = build()
+        if built is None:
+            return None
+        payload, headers = built
+        body = dumps(payload)
+        entry = (body, etag_for(body), headers)
+        self.entries.set(cache_key, entry)
+        return entry
+
+    def stats(self) -> Dict[str, Any]:
+        return dict(self.entries.stats(), version=self.local_version.value, orjson=ORJSON_AVAILABLE)
+
+_catalog_cache = None
+_catalog_cache_lock = threading.Lock()
+
+def get_catalog_cache() -> CatalogResponseCache:
+    """Return the process-wide CatalogResponseCache"""
+    global _catalog_cache
+    if _catalog_cache is None:
+        with _catalog_cache_lock:
+            if _catalog_cache is None:
+                _catalog_cache = CatalogResponseCache(
+                    max_entries=int(os.getenv("CATALOG_CACHE_SIZE", "4096")),
+                    max_bytes=int(os.getenv("CATALOG_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+                    fingerprint_ttl=float(os.getenv("CATALOG_FINGERPRINT_TTL", "2"))
+                )
+    return _catalog_cache
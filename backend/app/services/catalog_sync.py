@@ -0,0 +1,53 @@
+from typing import Dict, Any, Iterator
+import logging
+from sqlalchemy.orm import Session
+from ..models.product import Product
+from .vector_service import VectorService
+
+logger = logging.getLogger(__name__)
+
+def iter_catalog_products(db: Session, chunk_size: int = 500) -> Iterator[Dict[str, Any]]:
+    """Stream every product in the SQL catalog as a dict, ordered by ID"""
+    for product in db.query(Product).order_by(Product.id).yield_per(chunk_size):
+        yield product.to_dict()
+
+def sync_vector_index(db: Session, vector_service: VectorService) -> Dict[str, Any]:
+    """Make the vector index mirror the SQL catalog.
+
+    Every vector is keyed by ``Product.id``. Products that are new or changed are
+    embedded, and vectors whose ID no longer exists in SQL (deleted products or
+    entries written under an older ID scheme) are removed.
+    """
+    return vector_service.add_products(iter_catalog_products(db), prune=True)
+
+def reconcile_vector_index(db: Session, vector_service: VectorService, dry_run: bool = False) -> Dict[str, Any]:
+    """Find orphaned and duplicate vectors and, unless ``dry_run``, repair the index"""
+    sql_titles = {}
+    for product_id, title in db.query(Product.id, Product.title):
+        sql_titles[str(product_id)] = (title or '').strip().lower()
+
+    orphaned_ids = vector_service.find_orphaned_ids(sql_titles)
+
+    # An orphan is a duplicate when its title matches a product that is still in SQL,
+    # which is what the old process-salted hash() IDs left behind after each restart
+    known_titles = set(sql_titles.values())
+    duplicate_ids = []
+    if orphaned_ids:
+        orphaned = vector_service.backend.get(ids=orphaned_ids, include=["metadatas"])
+        for vector_id, metadata in zip(orphaned["ids"], orphaned["metadatas"]):
+            if (metadata.get('title') or '').strip().lower() in known_titles:
+                duplicate_ids.append(vector_id)
+
+    report = {
+        "sql_products": len(sql_titles),
+        "vector_products": vector_service.get_collection_count(),
+        "orphaned": len(orphaned_ids),
+        "duplicates": len(duplicate_ids),
+        "dry_run": dry_run
+    }
+
+    if not dry_run:
+        report["sync"] = sync_vector_index(db, vector_service)
+
+    logger.info(f"Vector index reconciliation: {report}")
+    return report
@@ -0,0 +1,79 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+import asyncio
+import os
+import threading
+
+# Default worker counts per stage, overridable with <STAGE>_CONCURRENCY env vars.
+# Search is CPU-bound (model encode + Chroma) so it gets few threads. LLM calls
+# do not need a stage: they use the async client, bounded by LLM_CONCURRENCY.
+DEFAULT_STAGE_CONCURRENCY = {
+    "search": 4,
+}
+
+class StagePool:
+    """Bounded thread pool for one stage of request handling.
+
+    Blocking work submitted through ``run`` executes on at most
+    ``max_workers`` threads, so a slow stage cannot occupy the event loop or
+    starve the thread pool FastAPI uses for ordinary endpoints.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        self.name = name
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"stage-{name}")
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                self.completed += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.max_workers, 0),
+            "completed": self.completed
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+_stage_pools: Dict[str, StagePool] = {}
+_stage_pools_lock = threading.Lock()
+
+def get_stage_pool(name: str) -> StagePool:
+    """Return the process-wide pool for a stage, creating it on first use"""
+    pool = _stage_pools.get(name)
+    if pool is None:
+        with _stage_pools_lock:
+            pool = _stage_pools.get(name)
+            if pool is None:
+                max_workers = int(os.getenv(f"{name.upper()}_CONCURRENCY", DEFAULT_STAGE_CONCURRENCY.get(name, 4)))
+                pool = StagePool(name, max_workers)
+                _stage_pools[name] = pool
+    return pool
+
+async def run_in_stage(name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run a blocking callable on the named stage's thread pool without blocking the event loop"""
+    return await get_stage_pool(name).run(fn, *args, **kwargs)
+
+def get_stage_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: pool.stats() for name, pool in _stage_pools.items()}
+
+def shutdown_stage_pools():
+    with _stage_pools_lock:
+        for pool in _stage_pools.values():
+            pool.shutdown()
+        _stage_pools.clear()
@@ -0,0 +1,114 @@
+from typing import Any, Dict, List, Optional
+from bisect import bisect_right
+from pathlib import Path
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FALLBACK_PATH = Path(__file__).parent.parent.parent / "sample_data" / "products_fallback.json"
+
+def normalize_category(category: str) -> str:
+    return " ".join((category or "").lower().split())
+
+class FallbackCatalog:
+    """The bundled demo catalog, held in memory with lookup indexes.
+
+    The JSON file is parsed once and indexed by id and by normalized category.
+    It is reloaded only when its mtime changes, and the mtime is checked at
+    most every ``check_interval`` seconds, so lookups normally do no file I/O.
+    Each reload swaps in a complete new snapshot, so readers never see a
+    half-built index.
+    """
+
+    def __init__(self, path: Path = DEFAULT_FALLBACK_PATH, check_interval: float = 5.0):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshot = self._build([], None)
+        self._checked_at: Optional[float] = None
+        self.reloads = 0
+
+    @staticmethod
+    def _build(products: List[Dict[str, Any]], mtime: Optional[float]) -> Dict[str, Any]:
+        by_id = {}
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for product in products:
+            if product.get('id') is not None:
+                by_id[product['id']] = product
+            by_category.setdefault(normalize_category(product.get('category', '')), []).append(product)
+
+        return {
+            "mtime": mtime,
+            "products": products,
+            "by_id": by_id,
+            "by_category": by_category,
+            "positions": {id(product): position for position, product in enumerate(products)},
+            # Ids in ascending order, for cursor pagination
+            "sorted_ids": sorted(by_id)
+        }
+
+    def _current(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        if self._checked_at is not None and now - self._checked_at < self.check_interval:
+            return self._snapshot
+
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval:
+                return self._snapshot
+            self._checked_at = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError:
+                return self._snapshot
+            if mtime != self._snapshot["mtime"]:
+                try:
+                    with open(self.path, 'r') as f:
+                        products = json.load(f)
+                    self._snapshot = self._build(products, mtime)
+                    self.reloads += 1
+                    logger.info(f"Loaded {len(products)} fallback products from {self.path}")
+                except Exception as e:
+                    logger.error(f"Error loading fallback catalog {self.path}: {e}")
+            return self._snapshot
+
+    def products(self) -> List[Dict[str, Any]]:
+        return self._current()["products"]
+
+    def get(self, product_id: int) -> Optional[Dict[str, Any]]:
+        return self._current()["by_id"].get(product_id)
+
+    def products_after(self, after_id: int, limit: int) -> List[Dict[str, Any]]:
+        """Up to ``limit`` products with an id greater than ``after_id``, in id order"""
+        snapshot = self._current()
+        sorted_ids = snapshot["sorted_ids"]
+        start = bisect_right(sorted_ids, after_id)
+        return [snapshot["by_id"][product_id] for product_id in sorted_ids[start:start + limit]]
+
+    def by_category(self, category: str) -> List[Dict[str, Any]]:
+        """Products whose category contains ``category`` (case-insensitive), in file order"""
+        snapshot = self._current()
+        needle = normalize_category(category)
+        # Substring matching runs over the distinct categories, not the products
+        matches = [products for name, products in snapshot["by_category"].items() if needle in name]
+        if len(matches) == 1:
+            return matches[0]
+        positions = snapshot["positions"]
+        return sorted((product for products in matches for product in products), key=lambda p: positions[id(p)])
+
+_fallback_catalog = None
+_fallback_catalog_lock = threading.Lock()
+
+def get_fallback_catalog() -> FallbackCatalog:
+    """Return the process-wide FallbackCatalog"""
+    global _fallback_catalog
+    if _fallback_catalog is None:
+        with _fallback_catalog_lock:
+            if _fallback_catalog is None:
+                _fallback_catalog = FallbackCatalog(
+                    check_interval=float(os.getenv("FALLBACK_CATALOG_CHECK_SECONDS", "5"))
+                )
+    return _fallback_catalog
@@ -0,0 +1,122 @@
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import heapq
+import math
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Common English words, plus the field labels create_product_text() adds to every document
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "i", "if", "in", "into", "is", "it", "its", "looking", "me", "my", "need", "of", "on",
+    "or", "our", "show", "so", "some", "something", "that", "the", "their", "this", "to",
+    "want", "was", "we", "what", "which", "with", "you", "your",
+    "title", "description", "category", "features", "brand"
+}
+
+def _stem(token: str) -> str:
+    # Just enough stemming to match plurals ("beds" -> "bed", "sofas" -> "sofa")
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case, split on non-alphanumerics, drop stopwords and strip plurals"""
+    return [_stem(token) for token in TOKEN_PATTERN.findall((text or "").lower()) if token not in STOPWORDS]
+
+def is_keyword_query(text: str, max_terms: int = 3) -> bool:
+    """Short queries made only of content words, e.g. "queen bed" or "3 door wardrobe" """
+    raw = TOKEN_PATTERN.findall((text or "").lower())
+    return 0 < len(raw) <= max_terms and not any(token in STOPWORDS for token in raw)
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[str]:
+    """Merge ranked ID lists: each list contributes 1 / (k + rank) to an ID's score"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores, key=lambda doc_id: -scores[doc_id])
+
+class BM25Index:
+    """Thread-safe in-memory BM25 inverted index over product documents.
+
+    Documents are keyed by vector ID and can be added, replaced and removed
+    incrementally, so the index follows every change made to the vector store.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Counter] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def _remove_locked(self, doc_id: str):
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        self._total_length -= self._doc_lengths.pop(doc_id)
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+
+    def upsert_many(self, documents: Iterable[Tuple[str, str]]):
+        """Index ``(doc_id, text)`` pairs, replacing any previous text for the same ID"""
+        tokenized = [(doc_id, Counter(tokenize(text))) for doc_id, text in documents]
+        with self._lock:
+            for doc_id, terms in tokenized:
+                self._remove_locked(doc_id)
+                self._doc_terms[doc_id] = terms
+                self._doc_lengths[doc_id] = sum(terms.values())
+                self._total_length += self._doc_lengths[doc_id]
+                for term, count in terms.items():
+                    self._postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_ids: Iterable[str]):
+        with self._lock:
+            for doc_id in doc_ids:
+                self._remove_locked(doc_id)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._doc_terms.clear()
+            self._doc_lengths.clear()
+            self._total_length = 0
+
+    def covers(self, terms: Iterable[str]) -> bool:
+        """Whether every term occurs in at least one document"""
+        with self._lock:
+            return all(term in self._postings for term in terms)
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """Top ``k`` ``(doc_id, score)`` pairs for ``query``, best first"""
+        terms = tokenize(query)
+        scores: Dict[str, float] = {}
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not doc_count or not terms:
+                return []
+            avg_length = self._total_length / doc_count
+            for term in set(terms):
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = tf + self.k1 * (1 - self.b + self.b * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"documents": len(self._doc_terms), "terms": len(self._postings)}
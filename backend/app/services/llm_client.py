@@ -0,0 +1,139 @@
+import os
+from typing import Any, AsyncIterator, Dict, Hashable, List, Optional
+import asyncio
+import logging
+import httpx
+
+# Optional OpenAI import - gracefully handle if not available
+try:
+    from openai import AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+    AsyncOpenAI = None
+
+logger = logging.getLogger(__name__)
+
+class AsyncLLMClient:
+    """Async chat-completion client shared by all requests in a worker.
+
+    - one pooled ``httpx.AsyncClient`` (keep-alive connections are reused)
+    - a hard per-call deadline
+    - at most ``max_concurrency`` upstream calls at a time
+    - identical in-flight requests (same ``coalesce_key``) share one upstream call
+
+    ``base_url`` may point at any OpenAI-compatible server, e.g. the local stub
+    in ``benchmarks/llm_stub_server.py``.
+    """
+
+    def __init__(self, api_key: str, base_url: Optional[str] = None, model: str = "gpt-3.5-turbo",
+                 timeout_seconds: float = 15.0, max_concurrency: int = 8, max_connections: int = 20,
+                 max_retries: int = 1):
+        if not OPENAI_AVAILABLE:
+            raise RuntimeError("openai package is not installed")
+        self.model = model
+        self.timeout_seconds = timeout_seconds
+        self.max_concurrency = max_concurrency
+        self._http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            timeout=httpx.Timeout(timeout_seconds, connect=min(5.0, timeout_seconds))
+        )
+        self._client = AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=self._http_client,
+            max_retries=max_retries
+        )
+        self._semaphore = None
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+        self.timeouts = 0
+
+    @classmethod
+    def from_env(cls, api_key: str) -> "AsyncLLMClient":
+        return cls(
+            api_key=api_key,
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            model=os.getenv("LLM_MODEL", "gpt-3.5-turbo"),
+            timeout_seconds=float(os.getenv("LLM_TIMEOUT_SECONDS", "15")),
+            max_concurrency=int(os.getenv("LLM_CONCURRENCY", "8")),
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "1"))
+        )
+
+    async def complete(self, messages: List[Dict[str, str]], coalesce_key: Optional[Hashable] = None,
+                       **params) -> str:
+        """Return the assistant message content for ``messages``.
+
+        Callers passing the same ``coalesce_key`` while a call is in flight
+        await that call instead of issuing their own.
+        """
+        if coalesce_key is None:
+            return await self._complete(messages, **params)
+
+        future = self._in_flight.get(coalesce_key)
+        if future is not None:
+            self.coalesced_calls += 1
+            # Shield so one waiter being cancelled does not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(self._complete(messages, **params))
+        self._in_flight[coalesce_key] = future
+        future.add_done_callback(lambda done: self._forget(coalesce_key, done))
+        return await asyncio.shield(future)
+
+    def _forget(self, coalesce_key: Hashable, future: asyncio.Future):
+        if self._in_flight.get(coalesce_key) is future:
+            del self._in_flight[coalesce_key]
+
+    async def _complete(self, messages: List[Dict[str, str]], **params) -> str:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            self.upstream_calls += 1
+            try:
+                response = await asyncio.wait_for(
+                    self._client.chat.completions.create(model=self.model, messages=messages, **params),
+                    timeout=self.timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise
+        return response.choices[0].message.content.strip()
+
+    async def stream(self, messages: List[Dict[str, str]], **params) -> AsyncIterator[str]:
+        """Yield the assistant message content as it is generated.
+
+        Streams are never coalesced; the deadline applies to the whole stream.
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async with self._semaphore:
+            self.upstream_calls += 1
+            try:
+                async with asyncio.timeout(self.timeout_seconds):
+                    response = await self._client.chat.completions.create(
+                        model=self.model, messages=messages, stream=True, **params
+                    )
+                    async for chunk in response:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            yield chunk.choices[0].delta.content
+            except TimeoutError:
+                self.timeouts += 1
+                raise
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model": self.model,
+            "max_concurrency": self.max_concurrency,
+            "in_flight": len(self._in_flight),
+            "upstream_calls": self.upstream_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "timeouts": self.timeouts
+        }
+
+    async def aclose(self):
+        await self._http_client.aclose()
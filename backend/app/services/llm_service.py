@@ -1,35 +1,93 @@
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Tuple
 import logging
 import json
-
-# Optional OpenAI import - gracefully handle if not available
-try:
-    import openai
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    openai = None
+import re
+import asyncio
+import threading
+from .llm_client import AsyncLLMClient, OPENAI_AVAILABLE
+from .response_cache import ResponseCache
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the prompt built by _build_messages changes, so cached
+# responses produced by the old prompt are no longer used
+PROMPT_VERSION = 1
+
+class MessageFieldStream:
+    """Incrementally extract the "message" string value from a streamed JSON response.
+
+    ``feed`` takes raw response chunks and returns the newly decoded characters
+    of the message, so they can be forwarded to the user as they arrive.
+    """
+
+    _ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+    def __init__(self):
+        self._buffer = ""
+        self.started = False
+        self.finished = False
+
+    def feed(self, chunk: str) -> str:
+        if self.finished:
+            return ""
+        self._buffer += chunk
+
+        if not self.started:
+            match = re.search(r'"message"\s*:\s*"', self._buffer)
+            if not match:
+                return ""
+            self.started = True
+            self._buffer = self._buffer[match.end():]
+
+        output = []
+        i = 0
+        while i < len(self._buffer):
+            char = self._buffer[i]
+            if char == '"':
+                self.finished = True
+                i += 1
+                break
+            if char == '\\':
+                if i + 1 >= len(self._buffer):
+                    break  # escape sequence continues in the next chunk
+                code = self._buffer[i + 1]
+                if code == 'u':
+                    if i + 6 > len(self._buffer):
+                        break
+                    output.append(chr(int(self._buffer[i + 2:i + 6], 16)))
+                    i += 6
+                    continue
+                output.append(self._ESCAPES.get(code, code))
+                i += 2
+                continue
+            output.append(char)
+            i += 1
+
+        self._buffer = self._buffer[i:]
+        return "".join(output)
+
 class LLMService:
     def __init__(self):
         self.openai_api_key = os.getenv("OPENAI_API_KEY")
+        self.client = None
+        self.response_cache = None
         if self.openai_api_key and OPENAI_AVAILABLE:
-            openai.api_key = self.openai_api_key
-        
-    def interpret_query_and_recommend(self, user_query: str, relevant_products: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Use LLM to interpret user query and provide recommendations"""
-        try:
-            if not self.openai_api_key or not OPENAI_AVAILABLE:
-                # Fallback response when OpenAI API key is not available or library not installed
-                return self._fallback_recommendation(user_query, relevant_products)
-            
-            # Create product context for LLM
-            products_context = self._format_products_for_llm(relevant_products)
+            self.client = AsyncLLMClient.from_env(self.openai_api_key)
             
-            system_prompt = """You are a helpful furniture and home decor shopping assistant. Your job is to:
+            if os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true":
+                self.response_cache = ResponseCache(
+                    path=os.getenv("LLM_CACHE_PATH", "./llm_cache.db"),
+                    ttl_seconds=float(os.getenv("LLM_CACHE_TTL", "86400")),
+                    max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+                )
+    
+    def _build_messages(self, user_query: str, relevant_products: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """Build the chat messages sent to the LLM"""
+        # Create product context for LLM
+        products_context = self._format_products_for_llm(relevant_products)
+        
+        system_prompt = """You are a helpful furniture and home decor shopping assistant. Your job is to:
 1. Understand abstract and nuanced user queries about furniture needs
 2. Match products from the available inventory to user requirements
 3. Provide thoughtful explanations for recommendations
@@ -45,7 +103,7 @@ Guidelines:
 - Include price information in recommendations
 """
 
-            user_prompt = f"""
+        user_prompt = f"""
 User Query: "{user_query}"
 
 Available Products:
@@ -63,35 +121,138 @@ Format your response as JSON with this structure:
     "clarifying_questions": [list of questions if seeking clarification]
 }}
 """
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    @staticmethod
+    def _request_key(user_query: str, relevant_products: List[Dict[str, Any]]) -> tuple:
+        """Identify a request by its normalized query and ordered candidate set"""
+        candidates = tuple(str(p.get('id') or p.get('title', '')) for p in relevant_products)
+        return (" ".join(user_query.lower().split()), candidates)
+    
+    async def interpret_query_and_recommend(self, user_query: str, relevant_products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Use LLM to interpret user query and provide recommendations"""
+        try:
+            if self.client is None:
+                # Fallback response when OpenAI API key is not available or library not installed
+                return self._fallback_recommendation(user_query, relevant_products)
             
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.7,
-                max_tokens=500
-            )
-            
-            # Parse LLM response
-            llm_response = response.choices[0].message.content.strip()
+            request_key = self._request_key(user_query, relevant_products)
+            llm_response = await self._cached_completion(user_query, relevant_products, request_key)
             
-            try:
-                parsed_response = json.loads(llm_response)
-                return self._process_llm_response(parsed_response, relevant_products)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, create a simple recommendation
-                return {
-                    "response_type": "recommendation",
-                    "message": llm_response,
-                    "products": relevant_products[:3]
-                }
+            return self._parse_llm_response(llm_response, relevant_products)
                 
         except Exception as e:
             logger.error(f"Error in LLM service: {e}")
             return self._fallback_recommendation(user_query, relevant_products)
     
+    def _parse_llm_response(self, llm_response: str, relevant_products: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Parse the raw LLM response into the chat response structure"""
+        try:
+            parsed_response = json.loads(llm_response)
+            return self._process_llm_response(parsed_response, relevant_products)
+        except json.JSONDecodeError:
+            # If JSON parsing fails, create a simple recommendation
+            return {
+                "response_type": "recommendation",
+                "message": llm_response,
+                "products": relevant_products[:3]
+            }
+    
+    async def stream_recommendation(self, user_query: str,
+                                    relevant_products: List[Dict[str, Any]]) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a recommendation as ("token", text) events followed by one ("done", result) event.
+
+        Tokens are the decoded characters of the response's "message" field as the
+        LLM generates them. The final result is the same dict that
+        interpret_query_and_recommend returns.
+        """
+        result = None
+        streamed = False
+        try:
+            if self.client is not None:
+                request_key = self._request_key(user_query, relevant_products)
+                cache_key = None
+                cached = None
+                if self.response_cache is not None:
+                    cache_key = ResponseCache.make_key(PROMPT_VERSION, self.client.model, *request_key)
+                    cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+                
+                if cached is not None:
+                    result = self._parse_llm_response(cached, relevant_products)
+                    yield "token", result.get("message", "")
+                else:
+                    message_stream = MessageFieldStream()
+                    chunks = []
+                    async for chunk in self.client.stream(
+                        self._build_messages(user_query, relevant_products),
+                        temperature=0.7,
+                        max_tokens=500
+                    ):
+                        chunks.append(chunk)
+                        text = message_stream.feed(chunk)
+                        if text:
+                            streamed = True
+                            yield "token", text
+                    
+                    llm_response = "".join(chunks).strip()
+                    result = self._parse_llm_response(llm_response, relevant_products)
+                    if not message_stream.started:
+                        # Not the JSON we asked for: the whole response is the message
+                        yield "token", result.get("message", "")
+                    if cache_key is not None:
+                        await asyncio.to_thread(self.response_cache.set, cache_key, llm_response)
+        
+        except Exception as e:
+            logger.error(f"Error streaming LLM response: {e}")
+            result = None
+        
+        if result is None:
+            result = self._fallback_recommendation(user_query, relevant_products)
+            if not streamed:
+                yield "token", result["message"]
+        
+        # The final frame always carries the complete message
+        yield "done", result
+    
+    async def _cached_completion(self, user_query: str, relevant_products: List[Dict[str, Any]],
+                                 request_key: tuple) -> str:
+        """Return the raw LLM response, from the persistent cache when possible"""
+        cache_key = None
+        if self.response_cache is not None:
+            # Same query + same ordered candidates + same prompt/model => same answer
+            cache_key = ResponseCache.make_key(PROMPT_VERSION, self.client.model, *request_key)
+            cached = await asyncio.to_thread(self.response_cache.get, cache_key)
+            if cached is not None:
+                return cached
+        
+        # Identical in-flight requests share a single upstream call
+        llm_response = await self.client.complete(
+            self._build_messages(user_query, relevant_products),
+            coalesce_key=request_key,
+            temperature=0.7,
+            max_tokens=500
+        )
+        
+        if cache_key is not None:
+            await asyncio.to_thread(self.response_cache.set, cache_key, llm_response)
+        return llm_response
+    
+    def get_stats(self) -> Dict[str, Any]:
+        if self.client is None:
+            return {"enabled": False}
+        stats = self.client.stats()
+        stats["response_cache"] = self.response_cache.stats() if self.response_cache else None
+        return stats
+    
+    async def aclose(self):
+        if self.client is not None:
+            await self.client.aclose()
+        if self.response_cache is not None:
+            self.response_cache.close()
+    
     def _format_products_for_llm(self, products: List[Dict[str, Any]]) -> str:
         """Format products for LLM context"""
         formatted_products = []
@@ -176,4 +337,16 @@ Format your response as JSON with this structure:
             "response_type": "recommendation",
             "message": message,
             "products": filtered_products[:4]  # Limit to 4 products
-        }
\ No newline at end of file
+        }
+
+_llm_service = None
+_llm_service_lock = threading.Lock()
+
+def get_llm_service() -> LLMService:
+    """Return the process-wide LLMService (also usable as a FastAPI dependency)"""
+    global _llm_service
+    if _llm_service is None:
+        with _llm_service_lock:
+            if _llm_service is None:
+                _llm_service = LLMService()
+    return _llm_service
@@ -0,0 +1,148 @@
+from typing import Dict, Any, Iterable, List
+import logging
+import os
+import time
+from sqlalchemy import JSON, Text, cast, func, insert, or_, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from ..models.product import Product
+from .catalog_cache import get_catalog_cache
+
+logger = logging.getLogger(__name__)
+
+# Product columns written by ingestion (everything except id and timestamps)
+INGEST_COLUMNS = [
+    "title", "price", "description", "features", "image_url", "category",
+    "brand", "availability", "product_url", "additional_attributes"
+]
+
+DEFAULT_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+
+def _chunks(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+def _upsert_statement(dialect: str):
+    """INSERT ... ON CONFLICT (id) DO UPDATE that only rewrites rows whose content
+    changed, returning the ids it actually wrote"""
+    dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    table = Product.__table__
+    stmt = dialect_insert(table)
+
+    changed = []
+    for column in INGEST_COLUMNS:
+        current, incoming = table.c[column], stmt.excluded[column]
+        if isinstance(table.c[column].type, JSON):
+            # Postgres has no equality operator for json, so compare the text
+            current, incoming = cast(current, Text), cast(incoming, Text)
+        changed.append(current.is_distinct_from(incoming))
+
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={**{column: stmt.excluded[column] for column in INGEST_COLUMNS}, "updated_at": func.now()},
+        where=or_(*changed)
+    ).returning(table.c.id)
+
+def bulk_upsert_products(db: Session, products: Iterable[Dict[str, Any]], key: str = "product_url",
+                         chunk_size: int = None, insert_only: bool = False) -> Dict[str, Any]:
+    """Insert new products and update changed ones in a few batched statements.
+
+    Existing rows are matched on ``key`` ("title", "product_url" or "id") with a
+    single lookup. With ``key="product_url"``, stored rows that have no URL
+    (such as the seeded sample catalog) are matched on title instead. New
+    rows are inserted in chunks of ``chunk_size``; existing ones go through
+    ``INSERT ... ON CONFLICT (id) DO UPDATE`` on Postgres and SQLite (plain
+    bulk UPDATEs elsewhere), which leaves unchanged rows alone. With
+    ``insert_only=True`` existing rows are skipped instead of updated, as are
+    new rows whose ``product_url`` is already taken.
+    Commits once at the end and returns
+    ``{rows, inserted, updated, unchanged, skipped, chunks, seconds, rows_per_sec}``.
+    """
+    chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+    start = time.perf_counter()
+    dialect = db.get_bind().dialect.name
+
+    # Last occurrence wins when the input repeats a key; rows without a key
+    # cannot match anything and are always inserted
+    by_key: Dict[Any, Dict[str, Any]] = {}
+    keyless: List[Dict[str, Any]] = []
+    for product in products:
+        row = {column: product.get(column) for column in INGEST_COLUMNS}
+        if product.get("id") is not None:
+            row["id"] = product["id"]
+        if product.get(key) is None:
+            keyless.append(row)
+        else:
+            by_key[product[key]] = row
+
+    key_column = getattr(Product, key)
+    existing_ids = {
+        existing_key: product_id
+        for existing_key, product_id in db.query(key_column, Product.id).filter(key_column.isnot(None))
+    }
+    # Seeded rows have no URL; without this, scraping after seeding duplicates them
+    ids_by_title = {}
+    if key == "product_url":
+        ids_by_title = {
+            title: product_id
+            for title, product_id in db.query(Product.title, Product.id).filter(Product.product_url.is_(None))
+        }
+
+    new_rows, existing_rows = list(keyless), []
+    for row_key, row in by_key.items():
+        product_id = existing_ids.get(row_key)
+        if product_id is None:
+            # A row without a URL is claimed by at most one incoming product
+            product_id = ids_by_title.pop(row["title"], None)
+        if product_id is not None:
+            existing_rows.append(dict(row, id=product_id))
+        else:
+            new_rows.append(row)
+
+    stats = {"rows": len(by_key) + len(keyless), "inserted": 0, "updated": 0, "unchanged": 0, "skipped": 0, "chunks": 0}
+    if insert_only:
+        # product_url is unique, so a new row reusing one would fail the insert
+        taken_urls = {url for (url,) in db.query(Product.product_url).filter(Product.product_url.isnot(None))}
+        insertable = [row for row in new_rows if row["product_url"] is None or row["product_url"] not in taken_urls]
+        stats["skipped"] = len(existing_rows) + len(new_rows) - len(insertable)
+        new_rows, existing_rows = insertable, []
+    table = Product.__table__
+
+    # Statements are executed with a list of parameter sets, which SQLAlchemy
+    # batches into multi-row VALUES without recompiling per chunk. Every row of
+    # one batch needs the same columns.
+    with_id = [row for row in new_rows if "id" in row]
+    without_id = [row for row in new_rows if "id" not in row]
+    for group in (with_id, without_id):
+        for chunk in _chunks(group, chunk_size):
+            db.execute(insert(table), chunk)
+            stats["inserted"] += len(chunk)
+            stats["chunks"] += 1
+
+    for chunk in _chunks(existing_rows, chunk_size):
+        if dialect in ("postgresql", "sqlite"):
+            updated = len(db.execute(_upsert_statement(dialect), chunk).all())
+        else:
+            db.execute(update(Product), chunk)
+            updated = len(chunk)
+        stats["updated"] += updated
+        stats["unchanged"] += len(chunk) - updated
+        stats["chunks"] += 1
+
+    if dialect == "postgresql" and any("id" in row for row in new_rows):
+        # Explicit ids do not advance the serial sequence; move it past them
+        db.execute(text(
+            "SELECT setval(pg_get_serial_sequence('products', 'id'), (SELECT COALESCE(MAX(id), 1) FROM products))"
+        ))
+
+    db.commit()
+    if stats["inserted"] or stats["updated"]:
+        get_catalog_cache().invalidate()
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    logger.info(
+        f"Bulk ingest: {stats['inserted']} inserted, {stats['updated']} updated, "
+        f"{stats['unchanged']} unchanged, {stats['skipped']} skipped in {stats['seconds']:.2f}s ({stats['rows_per_sec']:.0f} rows/s)"
+    )
+    return stats
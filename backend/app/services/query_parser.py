@@ -0,0 +1,147 @@
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+import re
+
+def normalize_value(value: Any) -> str:
+    """Case- and whitespace-insensitive form of a category or brand"""
+    return " ".join(str(value or "").lower().split())
+
+def normalize_availability(value: Any) -> str:
+    """Map the availability spellings in the catalog (True, "Available", "In stock", ...) to one value"""
+    if isinstance(value, bool):
+        return "available" if value else "unavailable"
+    text = normalize_value(value)
+    if text in ("true", "yes", "available", "in stock", "instock"):
+        return "available"
+    if text in ("false", "no", "unavailable", "out of stock", "sold out"):
+        return "unavailable"
+    return text
+
+class SearchFilters(NamedTuple):
+    """Structured constraints on a product search.
+
+    Translated into a Chroma ``where`` clause over the typed and normalized
+    metadata written by VectorService, so only matching vectors are ranked.
+    Being a tuple, it can be part of a cache key as is.
+    """
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    category: Optional[str] = None
+    brand: Optional[str] = None
+    availability: Optional[str] = None
+
+    @classmethod
+    def create(cls, min_price: Optional[float] = None, max_price: Optional[float] = None,
+               category: Optional[str] = None, brand: Optional[str] = None,
+               availability: Optional[str] = None) -> "SearchFilters":
+        """Build filters from user input, normalizing text values and dropping blanks"""
+        return cls(
+            min_price=float(min_price) if min_price is not None else None,
+            max_price=float(max_price) if max_price is not None else None,
+            category=normalize_value(category) or None,
+            brand=normalize_value(brand) or None,
+            availability=normalize_availability(availability) if availability not in (None, "") else None
+        )
+
+    @property
+    def is_empty(self) -> bool:
+        return all(value is None for value in self)
+
+    def combine(self, overrides: "SearchFilters") -> "SearchFilters":
+        """These filters with every field set in ``overrides`` replaced"""
+        return SearchFilters(*(override if override is not None else value for value, override in zip(self, overrides)))
+
+    def to_where(self) -> Optional[Dict[str, Any]]:
+        """The Chroma ``where`` clause for these filters, or None when there are none"""
+        clauses = []
+        has_price_bound = self.min_price is not None or self.max_price is not None
+        if has_price_bound and (self.min_price is None or self.min_price <= 0):
+            # Unknown prices are stored as 0, never let them satisfy a price filter
+            clauses.append({"price": {"$gt": 0.0}})
+        if self.min_price is not None and self.min_price > 0:
+            clauses.append({"price": {"$gte": self.min_price}})
+        if self.max_price is not None:
+            clauses.append({"price": {"$lte": self.max_price}})
+        if self.category is not None:
+            clauses.append({"category_key": self.category})
+        if self.brand is not None:
+            clauses.append({"brand_key": self.brand})
+        if self.availability is not None:
+            clauses.append({"availability_key": self.availability})
+
+        if not clauses:
+            return None
+        # Chroma wants $and to have at least two operands
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+# An amount such as "10000", "10,000", "rs 15k", "₹1.5 lakh"
+_CURRENCY = r"(?:rs\.?|inr|₹)"
+_AMOUNT = rf"(?P<currency{{n}}>{_CURRENCY}\s*)?(?P<number{{n}}>\d[\d,]*(?:\.\d+)?)\s*(?P<unit{{n}}>k|lakhs?|lacs?)?\b"
+
+def _amount(n: int) -> str:
+    return _AMOUNT.format(n=n)
+
+_PRICE_RANGE = re.compile(rf"\b(?:between|from)\s+{_amount(1)}\s*(?:and|to|-)\s*{_amount(2)}")
+_MAX_PRICE = re.compile(rf"(?:\b(?:under|below|less than|cheaper than|up to|upto|within|max|maximum|at most|budget(?: of)?)|<=?)\s*{_amount(1)}")
+_MIN_PRICE = re.compile(rf"(?:\b(?:over|above|more than|at least|min|minimum|starting at)|>=?)\s*{_amount(1)}")
+# Only explicit stock phrases: a bare "available" ("is this bed available for
+# rent") is not a request to drop products with other availability values
+_AVAILABILITY = re.compile(r"\b(?:in[- ]stock|available now)\b")
+
+# Bare small numbers are usually counts ("more than 3 drawers"), not prices
+_MIN_BARE_PRICE = 100
+
+def _parse_amount(match: re.Match, n: int) -> Optional[float]:
+    value = float(match.group(f"number{n}").replace(",", ""))
+    unit = match.group(f"unit{n}")
+    if unit == "k":
+        value *= 1000
+    elif unit:
+        value *= 100000
+    elif not match.group(f"currency{n}") and value < _MIN_BARE_PRICE:
+        return None
+    return value
+
+def _contains_phrase(text: str, phrase: str) -> bool:
+    return re.search(rf"\b{re.escape(phrase)}s?\b", text) is not None
+
+def parse_query(query: str, categories: Iterable[str] = (), brands: Iterable[str] = ()) -> Tuple[str, SearchFilters]:
+    """Pull price, category, brand and availability constraints out of a search query.
+
+    ``categories`` and ``brands`` are the values present in the catalog; one is
+    used as a filter when the query mentions it. Price and availability
+    phrases are removed from the returned text because they carry no meaning
+    for ranking. Category and brand words are kept, they still help ranking.
+    """
+    text = normalize_value(query)
+    filters: Dict[str, Any] = {}
+
+    match = _PRICE_RANGE.search(text)
+    if match:
+        low, high = _parse_amount(match, 1), _parse_amount(match, 2)
+        if low is not None and high is not None:
+            filters["min_price"], filters["max_price"] = min(low, high), max(low, high)
+            text = text[:match.start()] + text[match.end():]
+    for pattern, field in ((_MAX_PRICE, "max_price"), (_MIN_PRICE, "min_price")):
+        if field in filters:
+            continue
+        match = pattern.search(text)
+        if match:
+            value = _parse_amount(match, 1)
+            if value is not None:
+                filters[field] = value
+                text = text[:match.start()] + text[match.end():]
+
+    match = _AVAILABILITY.search(text)
+    if match:
+        filters["availability"] = "available"
+        text = text[:match.start()] + text[match.end():]
+
+    # Longest names first, so "living room" wins over "room"
+    for field, values in (("category", categories), ("brand", brands)):
+        for value in sorted({normalize_value(value) for value in values if value}, key=len, reverse=True):
+            if _contains_phrase(text, value):
+                filters[field] = value
+                break
+
+    text = " ".join(text.split())
+    return (text or normalize_value(query)), SearchFilters.create(**filters)
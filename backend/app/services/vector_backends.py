@@ -0,0 +1,674 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+import json
+import logging
+import operator
+import os
+import threading
+import time
+import numpy as np
+
+# Optional chromadb import - only the chroma backend needs it
+try:
+    import chromadb
+    CHROMADB_AVAILABLE = True
+except ImportError:
+    CHROMADB_AVAILABLE = False
+    chromadb = None
+
+logger = logging.getLogger(__name__)
+
+# Backends implement the subset of Chroma's collection API that VectorService
+# uses: get / upsert / update / delete / count / query, with Chroma-shaped
+# results and ``where`` clauses, plus persist(), stats() and version().
+# version() is an opaque token that changes when another process (or this
+# one) changes the stored vectors, so callers can rebuild derived indexes.
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row, so a dot product is the cosine similarity"""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class ChromaBackend:
+    """Chroma persistent collection (the default backend)"""
+
+    name = "chroma"
+
+    def __init__(self, persist_directory: str, collection_name: str = "products"):
+        if not CHROMADB_AVAILABLE:
+            raise RuntimeError("chromadb package is not installed")
+        self.persist_directory = Path(persist_directory)
+        self.client = chromadb.PersistentClient(path=persist_directory)
+        # We encode documents and queries ourselves, so no embedding function
+        self.collection = self.client.get_or_create_collection(name=collection_name, embedding_function=None)
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+            include: Sequence[str] = ("metadatas", "documents"), limit: Optional[int] = None,
+            offset: Optional[int] = None) -> Dict[str, Any]:
+        return self.collection.get(ids=ids, where=where, include=list(include), limit=limit, offset=offset)
+
+    def upsert(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict[str, Any]]):
+        self.collection.upsert(
+            ids=ids,
+            embeddings=np.asarray(embeddings, dtype=np.float32).tolist(),
+            documents=documents,
+            metadatas=metadatas
+        )
+
+    def update(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        self.collection.update(ids=ids, metadatas=metadatas)
+
+    def delete(self, ids: List[str]):
+        self.collection.delete(ids=ids)
+
+    def count(self) -> int:
+        return self.collection.count()
+
+    def query(self, query_embeddings: np.ndarray, n_results: int, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.collection.query(
+            query_embeddings=np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)).tolist(),
+            n_results=n_results,
+            where=where,
+            include=["metadatas", "distances"]
+        )
+
+    def persist(self):
+        # PersistentClient writes through on every call
+        pass
+
+    def version(self) -> Any:
+        # Chroma keeps no change counter; every write touches its SQLite files
+        mtimes = []
+        for file_name in ("chroma.sqlite3", "chroma.sqlite3-wal"):
+            try:
+                mtimes.append(os.stat(self.persist_directory / file_name).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return (self.count(), *mtimes)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name, "count": self.count()}
+
+_RANGE_OPERATORS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+
+def _best(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Column indexes and values of the ``k`` highest scores in each row, best first"""
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+class NumpyBackend:
+    """Exact (brute-force) cosine search over one contiguous embedding matrix.
+
+    Normalized embeddings are stored row-wise as float32 or float16 in one
+    ``.npy`` matrix; ids, documents and metadatas are parallel lists in
+    ``store.json``, which also names the array files. Arrays are
+    memory-mapped copy-on-write at load and after every persist, so startup
+    reads nothing up front and worker processes share the page cache.
+    Writes go to memory and reach disk on ``persist()``; another process's
+    persisted changes are picked up within ``check_interval`` seconds.
+
+    A query is one matrix product plus ``argpartition`` per block of rows, for
+    any number of query vectors at once. ``where`` clauses use Chroma's
+    operators and are evaluated on NumPy columns cached per metadata key.
+    """
+
+    name = "numpy"
+
+    def __init__(self, directory: str, dtype: str = "float32", block_rows: int = 65536, check_interval: float = 5.0):
+        self.directory = Path(directory)
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float16):
+            raise ValueError(f"Unsupported embedding dtype '{dtype}' (expected float32 or float16)")
+        self.block_rows = block_rows
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        # Row-aligned arrays (see _row_layout); rows [:len(self._ids)] are in
+        # use, the rest is spare capacity
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[Any, np.ndarray] = {}
+        self._dirty = False
+        self._store_mtime: Optional[float] = None
+        self._checked_at = time.monotonic()
+        # Bumped whenever a store written by another process is loaded
+        self._generation = 0
+        self._load()
+
+    @property
+    def _store_path(self) -> Path:
+        return self.directory / "store.json"
+
+    @property
+    def _matrix(self) -> Optional[np.ndarray]:
+        return self._arrays.get("matrix")
+
+    def _row_layout(self, dim: int) -> Dict[str, Tuple[int, np.dtype]]:
+        """Width and dtype of every row-aligned array"""
+        return {"matrix": (dim, self.dtype)}
+
+    def _encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        """Rows to store for normalized float32 ``vectors``, per array"""
+        return {"matrix": vectors}
+
+    def _state(self) -> Dict[str, Any]:
+        """Extra JSON-serializable state saved with the store"""
+        return {}
+
+    def _after_load(self, state: Dict[str, Any]):
+        pass
+
+    def _load(self):
+        try:
+            mtime = os.stat(self._store_path).st_mtime
+        except OSError:
+            return
+        try:
+            with open(self._store_path, "r") as f:
+                store = json.load(f)
+            arrays = {}
+            if store["ids"]:
+                for name, file_name in store["arrays"].items():
+                    arrays[name] = np.load(self.directory / file_name, mmap_mode="c")
+                    if arrays[name].shape[0] != len(store["ids"]):
+                        raise ValueError(f"{file_name} has {arrays[name].shape[0]} rows for {len(store['ids'])} ids")
+                if arrays["matrix"].dtype != self.dtype:
+                    arrays["matrix"] = arrays["matrix"].astype(self.dtype)
+                # Arrays written by another backend class are not maintained by this one
+                layout = self._row_layout(arrays["matrix"].shape[1])
+                arrays = {name: array for name, array in arrays.items() if name in layout}
+        except Exception as e:
+            # The next catalog sync re-embeds everything
+            logger.error(f"Error loading vector store {self.directory}, starting empty: {e}")
+            return
+
+        self._arrays = arrays
+        self._ids = store["ids"]
+        self._documents = store["documents"]
+        self._metadatas = store["metadatas"]
+        self._rows = {doc_id: row for row, doc_id in enumerate(self._ids)}
+        self._columns.clear()
+        self._store_mtime = mtime
+        self._generation += 1
+        self._after_load(store.get("state") or {})
+        logger.info(f"Loaded {len(self._ids)} vectors from {self.directory}")
+
+    def _refresh(self):
+        """Reload when another process persisted a newer store and we have no unsaved changes"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+        self._checked_at = now
+        try:
+            mtime = os.stat(self._store_path).st_mtime
+        except OSError:
+            return
+        if mtime != self._store_mtime and not self._dirty:
+            self._load()
+
+    def version(self) -> int:
+        # This process's own writes are already known to it, only reloads count
+        with self._lock:
+            self._refresh()
+            return self._generation
+
+    def _changed(self):
+        self._columns.clear()
+        self._dirty = True
+
+    def _ensure_capacity(self, rows: int, dim: int):
+        if self._matrix is not None and self._matrix.shape[1] != dim:
+            raise ValueError(f"Embedding dimension {dim} does not match the store ({self._matrix.shape[1]})")
+        for name, (width, dtype) in self._row_layout(dim).items():
+            array = self._arrays.get(name)
+            capacity = 0 if array is None else array.shape[0]
+            if rows <= capacity:
+                continue
+            # Grow geometrically so repeated upserts stay amortized O(1) per row
+            grown = np.empty((max(rows, 2 * capacity, 1024), width), dtype=dtype)
+            if array is not None:
+                grown[:len(self._ids)] = array[:len(self._ids)]
+            self._arrays[name] = grown
+
+    def get(self, ids: Optional[List[str]] = None, where: Optional[Dict[str, Any]] = None,
+            include: Sequence[str] = ("metadatas", "documents"), limit: Optional[int] = None,
+            offset: Optional[int] = None) -> Dict[str, Any]:
+        with self._lock:
+            self._refresh()
+            if ids is None:
+                rows = list(range(len(self._ids)))
+            else:
+                rows = [self._rows[doc_id] for doc_id in ids if doc_id in self._rows]
+            if where:
+                mask = self._where_mask(where)
+                rows = [row for row in rows if mask[row]]
+            rows = rows[offset or 0:]
+            if limit is not None:
+                rows = rows[:limit]
+
+            result: Dict[str, Any] = {"ids": [self._ids[row] for row in rows]}
+            if "metadatas" in include:
+                result["metadatas"] = [self._metadatas[row] for row in rows]
+            if "documents" in include:
+                result["documents"] = [self._documents[row] for row in rows]
+            return result
+
+    def upsert(self, ids: List[str], embeddings: np.ndarray, documents: List[str], metadatas: List[Dict[str, Any]]):
+        vectors = normalize_rows(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+        with self._lock:
+            self._ensure_capacity(len(self._ids) + len(ids), vectors.shape[1])
+            rows = []
+            for doc_id, document, metadata in zip(ids, documents, metadatas):
+                row = self._rows.get(doc_id)
+                if row is None:
+                    row = len(self._ids)
+                    self._rows[doc_id] = row
+                    self._ids.append(doc_id)
+                    self._documents.append(document)
+                    self._metadatas.append(metadata)
+                else:
+                    self._documents[row] = document
+                    self._metadatas[row] = metadata
+                rows.append(row)
+            for name, values in self._encode(vectors).items():
+                self._arrays[name][rows] = values
+            self._changed()
+
+    def update(self, ids: List[str], metadatas: List[Dict[str, Any]]):
+        with self._lock:
+            for doc_id, metadata in zip(ids, metadatas):
+                row = self._rows.get(doc_id)
+                if row is not None:
+                    self._metadatas[row] = metadata
+            self._changed()
+
+    def delete(self, ids: List[str]):
+        with self._lock:
+            for doc_id in ids:
+                row = self._rows.pop(doc_id, None)
+                if row is None:
+                    continue
+                # Move the last row into the gap so the arrays stay contiguous
+                last = len(self._ids) - 1
+                if row != last:
+                    moved = self._ids[last]
+                    for array in self._arrays.values():
+                        array[row] = array[last]
+                    self._ids[row] = moved
+                    self._documents[row] = self._documents[last]
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[moved] = row
+                self._ids.pop()
+                self._documents.pop()
+                self._metadatas.pop()
+            self._changed()
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def query(self, query_embeddings: np.ndarray, n_results: int, where: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Top ``n_results`` rows by cosine similarity for each query vector"""
+        queries = normalize_rows(np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32)))
+        with self._lock:
+            self._refresh()
+            # Filtering first means only the matching rows are scored
+            candidates = None
+            if where:
+                candidates = np.flatnonzero(self._where_mask(where))
+            available = len(self._ids) if candidates is None else len(candidates)
+            k = min(n_results, available)
+            if k <= 0:
+                return {"ids": [[] for _ in queries], "metadatas": [[] for _ in queries], "distances": [[] for _ in queries]}
+
+            top, top_scores = self._top_k(queries, candidates, k)
+            rows = top if candidates is None else candidates[top]
+
+            return {
+                "ids": [[self._ids[row] for row in query_rows] for query_rows in rows.tolist()],
+                "metadatas": [[self._metadatas[row] for row in query_rows] for query_rows in rows.tolist()],
+                # Cosine distance, so smaller is closer as with Chroma
+                "distances": (1.0 - top_scores).tolist()
+            }
+
+    def _top_k(self, queries: np.ndarray, candidates: Optional[np.ndarray], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Positions (among ``candidates``, or all rows) and scores of each query's ``k`` best rows"""
+        return _best(self._scores(queries, candidates), k)
+
+    def _blocks(self, array: np.ndarray, candidates: Optional[np.ndarray]):
+        """``(start, end, rows)`` blocks of ``array`` restricted to ``candidates``"""
+        total = len(self._ids) if candidates is None else len(candidates)
+        for start in range(0, total, self.block_rows):
+            end = min(start + self.block_rows, total)
+            yield start, end, array[start:end] if candidates is None else array[candidates[start:end]]
+
+    def _scores(self, queries: np.ndarray, candidates: Optional[np.ndarray]) -> np.ndarray:
+        """Similarity of every query to every (candidate) row, shape (queries, rows)"""
+        total = len(self._ids) if candidates is None else len(candidates)
+        scores = np.empty((len(queries), total), dtype=np.float32)
+        # Blocks bound the float16 -> float32 copy and keep it cache-friendly
+        for start, end, block in self._blocks(self._matrix, candidates):
+            scores[:, start:end] = queries @ block.astype(np.float32, copy=False).T
+        return scores
+
+    def _column(self, key: str, numeric: bool) -> np.ndarray:
+        column = self._columns.get((key, numeric))
+        if column is None:
+            values = [metadata.get(key) for metadata in self._metadatas]
+            if numeric:
+                column = np.array([value if isinstance(value, (int, float)) and not isinstance(value, bool) else np.nan
+                                   for value in values], dtype=np.float64)
+            else:
+                column = np.empty(len(values), dtype=object)
+                column[:] = values
+            self._columns[(key, numeric)] = column
+        return column
+
+    def _where_mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """Boolean row mask for a Chroma ``where`` clause"""
+        masks = [np.ones(len(self._ids), dtype=bool)]
+        for key, condition in where.items():
+            if key == "$and":
+                masks.extend(self._where_mask(clause) for clause in condition)
+            elif key == "$or":
+                masks.append(np.logical_or.reduce([self._where_mask(clause) for clause in condition]))
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for op, operand in condition.items():
+                    masks.append(self._compare(key, op, operand))
+        return np.logical_and.reduce(masks)
+
+    def _compare(self, key: str, op: str, operand: Any) -> np.ndarray:
+        if op in _RANGE_OPERATORS:
+            # NaN (missing or non-numeric) never satisfies a range
+            with np.errstate(invalid="ignore"):
+                return _RANGE_OPERATORS[op](self._column(key, numeric=True), operand)
+        column = self._column(key, numeric=False)
+        if op == "$eq":
+            return column == operand
+        if op == "$ne":
+            return column != operand
+        if op in ("$in", "$nin"):
+            values = set(operand)
+            mask = np.fromiter((value in values for value in column), dtype=bool, count=len(column))
+            return mask if op == "$in" else ~mask
+        raise ValueError(f"Unsupported where operator '{op}'")
+
+    def persist(self):
+        """Write the arrays and the metadata lists to disk if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            count = len(self._ids)
+            # Each persist writes new array files and the store is switched to
+            # them last, so a crash at any point leaves a consistent set on disk
+            version = time.time_ns()
+            files = {name: f"{name}-{version}.npy" for name in self._arrays} if count else {}
+            for name, file_name in files.items():
+                array = self._arrays[name][:count]
+                self._atomic_write(self.directory / file_name, lambda f: np.save(f, array))
+            store = {
+                "arrays": files,
+                "state": self._state(),
+                "ids": self._ids,
+                "documents": self._documents,
+                "metadatas": self._metadatas
+            }
+            self._atomic_write(self._store_path, lambda f: f.write(json.dumps(store).encode("utf-8")))
+            self._store_mtime = os.stat(self._store_path).st_mtime
+            self._dirty = False
+
+            # Map the saved files instead of holding private copies in memory
+            self._arrays = {name: np.load(self.directory / file_name, mmap_mode="c") for name, file_name in files.items()}
+            for path in self.directory.glob("*.npy"):
+                if path.name not in files.values():
+                    # Safe while mapped: the mapping keeps the old file alive
+                    path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _atomic_write(path: Path, write):
+        # Write then rename so a crash never leaves a truncated file behind
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count = len(self._ids)
+            return {
+                "backend": self.name,
+                "count": count,
+                "dim": 0 if self._matrix is None else self._matrix.shape[1],
+                "dtype": self.dtype.name,
+                **{f"{name}_bytes": count * array.shape[1] * array.itemsize for name, array in self._arrays.items()}
+            }
+
+class QuantizedBackend(NumpyBackend):
+    """NumpyBackend that scans compressed codes and re-ranks a shortlist exactly.
+
+    Queries scan only the codes. "int8" is scalar quantization with a
+    per-dimension step, one byte per dimension, 4x smaller than float32. "pq"
+    is product quantization: ``pq_subspaces`` bytes per vector, scored with
+    per-query lookup tables. The ``rerank_factor * k`` best candidates are
+    then re-scored against the float16 vectors. Those stay memory-mapped on
+    disk after ``persist()``, and only the shortlisted rows are paged in.
+
+    Quantizers are (re)trained from the stored vectors on ``persist()``: int8
+    when more than 1% of rows were clipped, PQ once 256 rows exist and again
+    whenever the catalog has doubled. Until PQ is trained, queries are exact.
+    """
+
+    name = "quantized"
+
+    PQ_CENTROIDS = 256
+    PQ_TRAIN_SAMPLE = 16384
+    PQ_TRAIN_ITERATIONS = 8
+    # Headroom over the observed range when the int8 step is trained
+    INT8_HEADROOM = 1.25
+
+    def __init__(self, directory: str, mode: str = "int8", pq_subspaces: int = 48, rerank_factor: int = 8, **kwargs):
+        if mode not in ("int8", "pq"):
+            raise ValueError(f"Unsupported quantization '{mode}' (expected int8 or pq)")
+        self.mode = mode
+        self.pq_subspaces = pq_subspaces
+        self.rerank_factor = max(1, rerank_factor)
+        self._scale: Optional[np.ndarray] = None
+        self._codebooks: Optional[np.ndarray] = None
+        self._trained_rows = 0
+        self._clipped_rows = 0
+        super().__init__(directory, dtype="float16", **kwargs)
+
+    def _row_layout(self, dim: int) -> Dict[str, Tuple[int, np.dtype]]:
+        layout = super()._row_layout(dim)
+        if self.mode == "int8":
+            layout["codes"] = (dim, np.dtype(np.int8))
+        else:
+            if dim % self.pq_subspaces:
+                raise ValueError(f"Embedding dimension {dim} is not divisible into {self.pq_subspaces} PQ subspaces")
+            layout["codes"] = (self.pq_subspaces, np.dtype(np.uint8))
+        return layout
+
+    def _encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        rows = super()._encode(vectors)
+        rows["codes"] = self._quantize(vectors)
+        return rows
+
+    def _quantize(self, vectors: np.ndarray) -> np.ndarray:
+        if self.mode == "int8":
+            if self._scale is None:
+                self._train_int8(vectors)
+            steps = vectors / self._scale
+            self._clipped_rows += int(np.count_nonzero(np.abs(steps).max(axis=1) > 127))
+            return np.clip(np.rint(steps), -127, 127).astype(np.int8)
+
+        if self._codebooks is None:
+            return np.zeros((len(vectors), self.pq_subspaces), dtype=np.uint8)
+        codes = np.empty((len(vectors), self.pq_subspaces), dtype=np.uint8)
+        for subspace, sub_vectors in enumerate(self._split(vectors)):
+            centroids = self._codebooks[subspace]
+            # argmin ||x - c||^2 == argmin ||c||^2 - 2 x.c
+            distances = (centroids ** 2).sum(axis=1) - 2 * sub_vectors @ centroids.T
+            codes[:, subspace] = distances.argmin(axis=1)
+        return codes
+
+    def _split(self, vectors: np.ndarray) -> np.ndarray:
+        """View ``vectors`` as (subspaces, rows, sub_dim)"""
+        return vectors.reshape(len(vectors), self.pq_subspaces, -1).transpose(1, 0, 2)
+
+    def _stored_vectors(self, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        count = len(self._ids)
+        matrix = self._matrix[:count] if rows is None else self._matrix[rows]
+        return matrix.astype(np.float32)
+
+    def _train_int8(self, vectors: np.ndarray):
+        self._scale = np.maximum(np.abs(vectors).max(axis=0) * self.INT8_HEADROOM / 127, 1e-8).astype(np.float32)
+        self._trained_rows = len(vectors)
+        self._clipped_rows = 0
+
+    def _train_pq(self, vectors: np.ndarray, rng: np.random.Generator):
+        """k-means with PQ_CENTROIDS centroids in every subspace"""
+        sample = vectors[rng.choice(len(vectors), min(len(vectors), self.PQ_TRAIN_SAMPLE), replace=False)]
+        codebooks = []
+        for sub_vectors in self._split(sample):
+            centroids = sub_vectors[rng.choice(len(sub_vectors), self.PQ_CENTROIDS, replace=False)].copy()
+            for _ in range(self.PQ_TRAIN_ITERATIONS):
+                assignment = ((centroids ** 2).sum(axis=1) - 2 * sub_vectors @ centroids.T).argmin(axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, assignment, sub_vectors)
+                counts = np.bincount(assignment, minlength=self.PQ_CENTROIDS)
+                # Empty clusters keep their previous centroid
+                filled = counts > 0
+                centroids[filled] = sums[filled] / counts[filled, None]
+            codebooks.append(centroids)
+        self._codebooks = np.stack(codebooks).astype(np.float32)
+        self._trained_rows = len(vectors)
+
+    def _maybe_retrain(self):
+        count = len(self._ids)
+        if not count:
+            return
+        if self.mode == "int8" and self._clipped_rows <= 0.01 * count:
+            return
+        if self.mode == "pq" and (count < self.PQ_CENTROIDS or (self._codebooks is not None and count < 2 * self._trained_rows)):
+            return
+
+        start = time.perf_counter()
+        vectors = self._stored_vectors()
+        if self.mode == "int8":
+            self._train_int8(vectors)
+        else:
+            self._train_pq(vectors, np.random.default_rng(0))
+        codes = np.empty((count, self._arrays["codes"].shape[1]), dtype=self._arrays["codes"].dtype)
+        for begin in range(0, count, self.block_rows):
+            codes[begin:begin + self.block_rows] = self._quantize(vectors[begin:begin + self.block_rows])
+        self._arrays["codes"] = codes
+        self._clipped_rows = 0
+        logger.info(f"Retrained {self.mode} quantizer on {count} vectors in {time.perf_counter() - start:.2f}s")
+
+    def persist(self):
+        with self._lock:
+            if self._dirty:
+                self._maybe_retrain()
+            super().persist()
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "trained_rows": self._trained_rows,
+            "scale": None if self._scale is None else self._scale.tolist(),
+            "codebooks": None if self._codebooks is None else self._codebooks.tolist()
+        }
+
+    def _after_load(self, state: Dict[str, Any]):
+        self._scale = np.asarray(state["scale"], dtype=np.float32) if state.get("scale") else None
+        self._codebooks = np.asarray(state["codebooks"], dtype=np.float32) if state.get("codebooks") else None
+        self._trained_rows = state.get("trained_rows", 0)
+        self._clipped_rows = 0
+        if not self._ids:
+            return
+        codes = self._arrays.get("codes")
+        if state.get("mode") == self.mode and codes is not None and (codes.shape[1], codes.dtype) == self._row_layout(self._matrix.shape[1])["codes"]:
+            return
+        # Written with another quantization (or by NumpyBackend): re-encode from the stored vectors
+        vectors = self._stored_vectors()
+        if self.mode == "int8":
+            self._train_int8(vectors)
+        elif len(vectors) >= self.PQ_CENTROIDS:
+            self._train_pq(vectors, np.random.default_rng(0))
+        else:
+            self._codebooks = None
+        self._arrays["codes"] = self._quantize(vectors)
+        self._dirty = True
+
+    def _approximate_scores(self, queries: np.ndarray, candidates: Optional[np.ndarray]) -> np.ndarray:
+        total = len(self._ids) if candidates is None else len(candidates)
+        scores = np.empty((len(queries), total), dtype=np.float32)
+        if self.mode == "int8":
+            # x.q ~= (codes * scale).q == codes.(scale * q)
+            scaled = queries * self._scale
+            for start, end, block in self._blocks(self._arrays["codes"], candidates):
+                scores[:, start:end] = scaled @ block.astype(np.float32).T
+            return scores
+
+        # One lookup table per query: the dot product of each query subvector with every centroid
+        tables = np.einsum("scd,qsd->qsc", self._codebooks, queries.reshape(len(queries), self.pq_subspaces, -1))
+        subspaces = np.arange(self.pq_subspaces)
+        for start, end, block in self._blocks(self._arrays["codes"], candidates):
+            for index, table in enumerate(tables):
+                scores[index, start:end] = table[subspaces, block].sum(axis=1)
+        return scores
+
+    def _top_k(self, queries: np.ndarray, candidates: Optional[np.ndarray], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        total = len(self._ids) if candidates is None else len(candidates)
+        shortlist = k * self.rerank_factor
+        if shortlist >= total or (self.mode == "pq" and self._codebooks is None):
+            return super()._top_k(queries, candidates, k)
+
+        short, _ = _best(self._approximate_scores(queries, candidates), shortlist)
+        rows = short if candidates is None else candidates[short]
+        # Exact re-rank: only the shortlisted full-precision rows are read
+        vectors = self._stored_vectors(rows.ravel()).reshape(len(queries), shortlist, -1)
+        top, top_scores = _best(np.einsum("qsd,qd->qs", vectors, queries), k)
+        return np.take_along_axis(short, top, axis=1), top_scores
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        codes_width = self._arrays["codes"].shape[1] if "codes" in self._arrays else 0
+        stats.update(
+            quantization=self.mode,
+            rerank_factor=self.rerank_factor,
+            # What a query scans; the float16 matrix is only paged in for re-ranking
+            scanned_bytes_per_vector=codes_width,
+            trained=self._scale is not None if self.mode == "int8" else self._codebooks is not None
+        )
+        return stats
+
+def create_vector_backend(name: Optional[str] = None):
+    """Open the vector backend named by ``name`` or VECTOR_BACKEND (chroma, numpy or quantized)"""
+    name = (name or os.getenv("VECTOR_BACKEND", "chroma")).lower()
+    if name == "chroma":
+        return ChromaBackend(os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db"))
+    if name == "numpy":
+        return NumpyBackend(
+            os.getenv("NUMPY_VECTOR_DIRECTORY", "./vector_store"),
+            dtype=os.getenv("NUMPY_VECTOR_DTYPE", "float32"),
+            check_interval=float(os.getenv("NUMPY_VECTOR_CHECK_SECONDS", "5"))
+        )
+    if name == "quantized":
+        return QuantizedBackend(
+            os.getenv("QUANTIZED_VECTOR_DIRECTORY", "./vector_store_quantized"),
+            mode=os.getenv("VECTOR_QUANTIZATION", "int8").lower(),
+            pq_subspaces=int(os.getenv("PQ_SUBSPACES", "48")),
+            rerank_factor=int(os.getenv("QUANTIZED_RERANK_FACTOR", "8")),
+            check_interval=float(os.getenv("NUMPY_VECTOR_CHECK_SECONDS", "5"))
+        )
+    raise ValueError(f"Unknown vector backend '{name}' (expected chroma, numpy or quantized)")
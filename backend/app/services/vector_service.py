@@ -1,28 +1,200 @@
 import os
-import chromadb
-from chromadb.utils import embedding_functions
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Sequence, Tuple
+from itertools import islice
+import numpy as np
 import json
+import hashlib
 import logging
+import threading
+import time
 from sentence_transformers import SentenceTransformer
+from .cache import LRUCache, VersionCounter
+from .lexical_index import BM25Index, is_keyword_query, reciprocal_rank_fusion, tokenize
+from .query_parser import SearchFilters, normalize_availability, normalize_value
+from .vector_backends import create_vector_backend
+from ..database import SessionLocal
+from ..models.product import Product
 
 logger = logging.getLogger(__name__)
 
+# Metadata kept with each vector in "sql" metadata mode: what filters and
+# change detection need. Everything else is joined from the products table.
+LEAN_METADATA_FIELDS = ("price", "category_key", "brand_key", "availability_key")
+PRODUCT_FIELDS = (
+    "title", "price", "description", "image_url", "category", "brand",
+    "availability", "product_url", "features", "additional_attributes"
+)
+
 class VectorService:
     def __init__(self):
-        self.chroma_persist_directory = os.getenv("CHROMA_PERSIST_DIRECTORY", "./chroma_db")
-        self.client = chromadb.PersistentClient(path=self.chroma_persist_directory)
+        # "chroma" (default), "numpy" or "quantized", see vector_backends.py
+        self.backend_name = os.getenv("VECTOR_BACKEND", "chroma").lower()
+        # "full" stores every product field with its vector; "sql" stores only
+        # LEAN_METADATA_FIELDS for products that have a database ID and reads
+        # the rest from the products table by ID
+        self.metadata_mode = os.getenv("VECTOR_METADATA", "full").lower()
+        self.model_name = os.getenv("EMBEDDING_MODEL_NAME", "all-MiniLM-L6-v2")
+        
+        # The vector backend and the embedding model are loaded on first use,
+        # so constructing the service is cheap and never blocks import
+        self.ingest_batch_size = int(os.getenv("VECTOR_INGEST_BATCH_SIZE", "256"))
+        
+        self._model = None
+        self._backend = None
+        # Set from the model's tokenizer at load, see normalize_query
+        self._lowercase_queries = False
+        self._load_lock = threading.Lock()
+        self.load_seconds = None
         
-        # Use sentence-transformers for embeddings (free alternative to OpenAI)
-        self.embedding_function = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name="all-MiniLM-L6-v2"
+        # Popular queries repeat a lot, so their embeddings are cached
+        self.query_embedding_cache = LRUCache(
+            max_entries=int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "1024")),
+            ttl_seconds=float(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "3600"))
         )
         
-        # Create or get collection
-        self.collection = self.client.get_or_create_collection(
-            name="products",
-            embedding_function=self.embedding_function
+        # Search results are cached per catalog version; any change to the
+        # collection bumps the version so stale results are never served.
+        # The TTL bounds staleness when another worker changed the catalog.
+        self.catalog_version = VersionCounter()
+        self.search_result_cache = LRUCache(
+            max_entries=int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "2048")),
+            ttl_seconds=float(os.getenv("SEARCH_RESULT_CACHE_TTL", "300")),
+            max_bytes=int(os.getenv("SEARCH_RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+            sizeof=lambda products: len(json.dumps(products, default=str))
         )
+        
+        # BM25 index over the same documents as the collection, built at load
+        # time and kept in sync by add_products/delete_products. Changes made
+        # by other processes are detected through backend.version() at most
+        # every LEXICAL_INDEX_CHECK_SECONDS and trigger a rebuild.
+        # "hybrid" fuses it with vector results; "vector" is dense-only.
+        self.lexical_index = BM25Index()
+        self.search_mode = os.getenv("SEARCH_MODE", "hybrid").lower()
+        self.hybrid_candidates = int(os.getenv("HYBRID_CANDIDATES", "20"))
+        self.lexical_fast_path = os.getenv("LEXICAL_FAST_PATH", "true").lower() == "true"
+        self.fast_path_hits = 0
+        # BM25 candidates fetched per requested result when filters must be applied to them
+        self.filter_oversample = int(os.getenv("LEXICAL_FILTER_OVERSAMPLE", "5"))
+        self.index_check_seconds = float(os.getenv("LEXICAL_INDEX_CHECK_SECONDS", "5"))
+        self._indexed_version = None
+        self._indexes_checked_at = time.monotonic()
+        self._index_lock = threading.Lock()
+        
+        # Distinct categories and brands in the collection, for the query parser
+        self.facet_values = {"category": set(), "brand": set()}
+    
+    def _ensure_loaded(self):
+        """Open the vector backend and load the embedding model exactly once"""
+        if self._backend is not None:
+            return
+        
+        with self._load_lock:
+            if self._backend is not None:
+                return
+            
+            start = time.perf_counter()
+            backend = create_vector_backend(self.backend_name)
+            
+            # Use sentence-transformers for embeddings (free alternative to OpenAI).
+            # We encode documents and queries ourselves so ingestion can be batched.
+            model = SentenceTransformer(self.model_name)
+            
+            self._model = model
+            self._backend = backend
+            self._lowercase_queries = bool(getattr(getattr(model, "tokenizer", None), "do_lower_case", False))
+            # Cached query embeddings belong to the previously loaded model
+            self.query_embedding_cache.clear()
+            self._build_indexes(backend)
+            self.load_seconds = time.perf_counter() - start
+            logger.info(
+                f"Vector service loaded model '{self.model_name}' and {backend.name} backend "
+                f"in {self.load_seconds:.2f}s"
+            )
+    
+    def _build_indexes(self, backend):
+        """Build the lexical index and facet values from every stored document"""
+        # Taken first, so changes made while building trigger another rebuild
+        self._indexed_version = backend.version()
+        # Built aside and swapped in, so searches never see a partial index
+        lexical_index = BM25Index()
+        facet_values = {field: set() for field in self.facet_values}
+        offset = 0
+        while True:
+            page = backend.get(include=["documents", "metadatas"], limit=self.ingest_batch_size, offset=offset)
+            if not page["ids"]:
+                break
+            documents = self._fill_documents(page["ids"], page["documents"])
+            lexical_index.upsert_many(zip(page["ids"], documents))
+            self._record_facets(page["metadatas"], facet_values)
+            offset += len(page["ids"])
+        self.lexical_index = lexical_index
+        self.facet_values = facet_values
+        logger.info(f"Lexical index built over {len(lexical_index)} documents")
+    
+    def _refresh_indexes(self, force: bool = False):
+        """Rebuild the lexical index and facets if another process changed the backend.
+
+        Checked at most every ``index_check_seconds`` unless ``force`` is set.
+        """
+        now = time.monotonic()
+        if not force and now - self._indexes_checked_at < self.index_check_seconds:
+            return
+        self._indexes_checked_at = now
+        if self.backend.version() == self._indexed_version:
+            return
+        
+        with self._index_lock:
+            if self.backend.version() == self._indexed_version:
+                return
+            logger.info("Vector store changed in another process, rebuilding the lexical index")
+            self._build_indexes(self.backend)
+            self.invalidate_search_cache()
+    
+    def _fill_documents(self, ids: List[str], documents: List[Optional[str]]) -> List[str]:
+        """Rebuild documents that were not stored with their vectors from the products table"""
+        missing = [vector_id for vector_id, document in zip(ids, documents) if not document]
+        if not missing:
+            return documents
+        products = self._load_sql_products(missing)
+        return [
+            document or (self.create_product_text(products[vector_id]) if vector_id in products else "")
+            for vector_id, document in zip(ids, documents)
+        ]
+    
+    def _record_facets(self, metadatas: Iterable[Dict[str, Any]],
+                       facet_values: Optional[Dict[str, set]] = None):
+        facet_values = self.facet_values if facet_values is None else facet_values
+        for metadata in metadatas:
+            for field, values in facet_values.items():
+                # Lean metadata only has the normalized key
+                value = normalize_value(metadata.get(f"{field}_key") or metadata.get(field))
+                if value:
+                    values.add(value)
+    
+    def facets(self) -> Dict[str, List[str]]:
+        """Known categories and brands, as ``parse_query`` keyword arguments"""
+        self._ensure_loaded()
+        self._refresh_indexes()
+        return {"categories": sorted(self.facet_values["category"]), "brands": sorted(self.facet_values["brand"])}
+    
+    @property
+    def model(self) -> SentenceTransformer:
+        self._ensure_loaded()
+        return self._model
+    
+    @property
+    def backend(self):
+        self._ensure_loaded()
+        return self._backend
+    
+    @property
+    def is_loaded(self) -> bool:
+        return self._backend is not None
+    
+    def warm_up(self) -> float:
+        """Load the model and backend ahead of the first request; returns the load time in seconds"""
+        self._ensure_loaded()
+        return self.load_seconds
     
     def create_product_text(self, product: Dict[str, Any]) -> str:
         """Create searchable text from product data"""
@@ -51,88 +223,451 @@ class VectorService:
         
         return " | ".join(text_parts)
     
-    def add_products(self, products: List[Dict[str, Any]]):
-        """Add products to vector database"""
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Encode texts into a float32 embedding matrix of shape (len(texts), dim)"""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=min(max(len(texts), 1), self.ingest_batch_size),
+            convert_to_numpy=True,
+            show_progress_bar=False
+        )
+        return np.asarray(embeddings, dtype=np.float32)
+    
+    def normalize_query(self, query: str) -> str:
+        """Cache key form of a query: whitespace-normalized, and lower-cased only
+        when the model's tokenizer lower-cases its input anyway"""
+        query = " ".join(query.split())
+        return query.lower() if self._lowercase_queries else query
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query, serving repeated queries from the LRU+TTL cache"""
+        return self.embed_queries([query])[0]
+    
+    def embed_queries(self, queries: Sequence[str]) -> np.ndarray:
+        """Embed search queries as a (len(queries), dim) matrix.
+
+        Cached embeddings are reused and the rest are encoded in one batch.
+        """
+        self._ensure_loaded()
+        keys = [(self.model_name, self.normalize_query(query)) for query in queries]
+        # The first spelling of each key is what gets encoded, never the normalized key
+        originals = {}
+        for key, query in zip(keys, queries):
+            originals.setdefault(key, query)
+        embeddings = {key: self.query_embedding_cache.get(key) for key in keys}
+        missing = [key for key, embedding in embeddings.items() if embedding is None]
+        if missing:
+            for key, embedding in zip(missing, self.encode([originals[key] for key in missing])):
+                # Copied so a cached row does not keep the whole batch alive
+                embedding = embedding.copy()
+                embedding.setflags(write=False)
+                self.query_embedding_cache.set(key, embedding)
+                embeddings[key] = embedding
+        return np.stack([embeddings[key] for key in keys])
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            "catalog_version": self.catalog_version.value,
+            "query_embeddings": self.query_embedding_cache.stats(),
+            "search_results": self.search_result_cache.stats(),
+            "lexical_index": dict(self.lexical_index.stats(), mode=self.search_mode, fast_path_hits=self.fast_path_hits)
+        }
+    
+    def get_backend_stats(self) -> Dict[str, Any]:
+        if self._backend is None:
+            return {"backend": self.backend_name, "loaded": False}
+        return self._backend.stats()
+    
+    def invalidate_search_cache(self):
+        """Mark the catalog as changed so cached search results are no longer used"""
+        self.catalog_version.bump()
+        self.search_result_cache.clear()
+    
+    def _product_metadata(self, product: Dict[str, Any]) -> Dict[str, Any]:
+        """Store metadata (all product info except the searchable text)"""
+        def value(key: str, default: Any) -> Any:
+            # Chroma rejects None metadata values
+            field = product.get(key)
+            return default if field is None else field
+        
+        metadata = {
+            "title": value('title', ''),
+            # Typed so price range filters compare numbers
+            "price": float(value('price', 0.0)),
+            "description": value('description', ''),
+            "image_url": value('image_url', ''),
+            "category": value('category', ''),
+            "brand": value('brand', ''),
+            "availability": value('availability', ''),
+            "product_url": value('product_url', ''),
+            "features": json.dumps(value('features', [])),
+            "additional_attributes": json.dumps(value('additional_attributes', {})),
+            # Normalized copies for exact-match filters (Chroma has no case-insensitive match)
+            "category_key": normalize_value(product.get('category')),
+            "brand_key": normalize_value(product.get('brand')),
+            "availability_key": normalize_availability(product.get('availability'))
+        }
+        if self._joins_sql(self._product_id(product)):
+            return {field: metadata[field] for field in LEAN_METADATA_FIELDS}
+        return metadata
+    
+    def _joins_sql(self, vector_id: str) -> bool:
+        """Whether this vector's product fields live only in the products table"""
+        return self.metadata_mode == "sql" and vector_id.isdigit()
+    
+    def _product_id(self, product: Dict[str, Any]) -> str:
+        return product_vector_id(product)
+    
+    @staticmethod
+    def _batched(items: Iterable[Any], batch_size: int) -> Iterator[List[Any]]:
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """Stable hash of a product's searchable text, stored alongside its vector"""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
+    def add_products(self, products: Iterable[Dict[str, Any]], batch_size: Optional[int] = None,
+                     prune: bool = False) -> Dict[str, Any]:
+        """Incrementally upsert products into the vector database in fixed-size batches.
+
+        ``products`` may be any iterable (e.g. a generator over a large catalog);
+        only one batch of documents and embeddings is held in memory at a time.
+        Products whose searchable text hashes to the stored ``content_hash`` are
+        not re-embedded; if only their metadata changed it is updated in place.
+        With ``prune=True`` the given products are treated as the complete
+        catalog and vectors for any other IDs are deleted.
+        Returns ingest statistics including embedding throughput in docs/sec.
+        """
+        batch_size = batch_size or self.ingest_batch_size
+        stats = {
+            "embedded": 0,
+            "metadata_updated": 0,
+            "unchanged": 0,
+            "deleted": 0,
+            "batches": 0,
+            "seconds": 0.0,
+            "docs_per_sec": 0.0
+        }
+        seen_ids = set()
+        
         try:
-            documents = []
-            metadatas = []
-            ids = []
+            # Incremental updates below assume the indexes match the backend
+            self._refresh_indexes(force=True)
             
-            for product in products:
-                # Create searchable text
-                document = self.create_product_text(product)
-                documents.append(document)
+            for batch in self._batched(products, batch_size):
+                batch_start = time.perf_counter()
                 
-                # Store metadata (all product info except the searchable text)
-                metadata = {
-                    "title": product.get('title', ''),
-                    "price": product.get('price', 0.0),
-                    "description": product.get('description', ''),
-                    "image_url": product.get('image_url', ''),
-                    "category": product.get('category', ''),
-                    "brand": product.get('brand', ''),
-                    "availability": product.get('availability', ''),
-                    "product_url": product.get('product_url', ''),
-                    "features": json.dumps(product.get('features', [])),
-                    "additional_attributes": json.dumps(product.get('additional_attributes', {}))
-                }
-                metadatas.append(metadata)
+                # Last occurrence wins if the same product appears twice in a batch
+                entries = {}
+                for product in batch:
+                    document = self.create_product_text(product)
+                    metadata = self._product_metadata(product)
+                    metadata["content_hash"] = self.content_hash(document)
+                    entries[self._product_id(product)] = (document, metadata)
+                seen_ids.update(entries)
+                
+                existing = self.backend.get(ids=list(entries), include=["metadatas"])
+                existing_metadata = dict(zip(existing["ids"], existing["metadatas"]))
+                
+                embed_ids, embed_documents, stored_documents, embed_metadatas = [], [], [], []
+                update_ids, update_metadatas = [], []
+                for product_id, (document, metadata) in entries.items():
+                    stored = existing_metadata.get(product_id)
+                    if not stored or stored.get("content_hash") != metadata["content_hash"]:
+                        embed_ids.append(product_id)
+                        embed_documents.append(document)
+                        stored_documents.append("" if self._joins_sql(product_id) else document)
+                        embed_metadatas.append(metadata)
+                    elif stored != metadata:
+                        update_ids.append(product_id)
+                        update_metadatas.append(metadata)
+                    else:
+                        stats["unchanged"] += 1
+                
+                if embed_ids:
+                    embeddings = self.encode(embed_documents)
+                    self.backend.upsert(
+                        ids=embed_ids,
+                        embeddings=embeddings,
+                        documents=stored_documents,
+                        metadatas=embed_metadatas
+                    )
+                    self.lexical_index.upsert_many(zip(embed_ids, embed_documents))
+                
+                if update_ids:
+                    # Searchable text is unchanged, so the stored embedding is still valid
+                    self.backend.update(ids=update_ids, metadatas=update_metadatas)
                 
-                # Use product ID if available, otherwise use title hash
-                product_id = str(product.get('id', hash(product.get('title', ''))))
-                ids.append(product_id)
+                if embed_ids or update_ids:
+                    self._record_facets(embed_metadatas + update_metadatas)
+                    self.invalidate_search_cache()
+                
+                elapsed = time.perf_counter() - batch_start
+                stats["embedded"] += len(embed_ids)
+                stats["metadata_updated"] += len(update_ids)
+                stats["batches"] += 1
+                stats["seconds"] += elapsed
+                logger.info(
+                    f"Vector ingest batch {stats['batches']}: embedded {len(embed_ids)}, "
+                    f"updated {len(update_ids)}, skipped {len(entries) - len(embed_ids) - len(update_ids)} "
+                    f"in {elapsed:.2f}s ({len(embed_ids) / elapsed if elapsed else 0.0:.1f} docs/sec)"
+                )
             
-            # Add to collection
-            self.collection.add(
-                documents=documents,
-                metadatas=metadatas,
-                ids=ids
-            )
+            if prune:
+                stats["deleted"] = self.delete_products_except(seen_ids)
+            self.backend.persist()
+            self._indexed_version = self.backend.version()
             
-            logger.info(f"Added {len(products)} products to vector database")
+            if stats["seconds"]:
+                stats["docs_per_sec"] = stats["embedded"] / stats["seconds"]
+            logger.info(
+                f"Vector ingest done: {stats['embedded']} embedded, {stats['metadata_updated']} updated, "
+                f"{stats['unchanged']} unchanged, {stats['deleted']} deleted "
+                f"({stats['docs_per_sec']:.1f} docs/sec)"
+            )
             
         except Exception as e:
             logger.error(f"Error adding products to vector database: {e}")
+        
+        return stats
+    
+    def delete_products_except(self, keep_ids: Iterable[str]) -> int:
+        """Delete every vector whose ID is not in ``keep_ids``; returns the number deleted"""
+        stale_ids = self.find_orphaned_ids(keep_ids)
+        self.delete_products(stale_ids)
+        return len(stale_ids)
     
-    def search_products(self, query: str, n_results: int = 5) -> List[Dict[str, Any]]:
-        """Search for products using vector similarity"""
+    def find_orphaned_ids(self, keep_ids: Iterable[str]) -> List[str]:
+        """Return IDs stored in the collection that are not in ``keep_ids``"""
+        keep_ids = set(keep_ids)
+        return [product_id for product_id in self.backend.get(include=[])["ids"]
+                if product_id not in keep_ids]
+    
+    def delete_products(self, ids: List[str]):
+        """Delete vectors by ID"""
+        if not ids:
+            return
+        self._refresh_indexes(force=True)
+        for batch in self._batched(ids, self.ingest_batch_size):
+            self.backend.delete(ids=batch)
+        self.lexical_index.remove(ids)
+        self.backend.persist()
+        self._indexed_version = self.backend.version()
+        self.invalidate_search_cache()
+    
+    def search_products(self, query: str, n_results: int = 5,
+                        filters: Optional[SearchFilters] = None) -> List[Dict[str, Any]]:
+        """Search for products using BM25 and vector similarity.
+
+        In hybrid mode the top ``hybrid_candidates`` of each ranking are merged
+        with reciprocal rank fusion. Short keyword queries whose terms all occur
+        in the catalog are answered from the BM25 index alone, skipping the
+        embedding model. ``filters`` are pushed down to the backend as a ``where``
+        clause, so every candidate already satisfies them. Results are cached
+        per (query, n_results, filters, catalog version), so hot queries skip
+        all of this until the catalog changes.
+        """
+        return self.search_many([query], n_results, [filters])[0]
+    
+    def search_many(self, queries: Sequence[str], n_results: int = 5,
+                    filters: Optional[Sequence[Optional[SearchFilters]]] = None) -> List[List[Dict[str, Any]]]:
+        """Search for several queries at once, returning one result list per query.
+
+        Ranks exactly like ``search_products``, but every query that needs the
+        embedding model is encoded in one forward pass, and the vector top-k is
+        one backend query per distinct set of ``filters`` (one per query, or
+        None) instead of one per query.
+        """
+        filters = list(filters) if filters is not None else [None] * len(queries)
+        if len(filters) != len(queries):
+            raise ValueError("filters must have one entry per query")
+        
         try:
-            results = self.collection.query(
-                query_texts=[query],
-                n_results=n_results
-            )
+            # Cache keys depend on the model's tokenizer (see normalize_query)
+            self._ensure_loaded()
+            results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+            # Queries with the same normalized form are searched once
+            pending: Dict[Any, Tuple[str, Optional[SearchFilters], List[int]]] = {}
+            for index, (query, query_filters) in enumerate(zip(queries, filters)):
+                if query_filters is not None and query_filters.is_empty:
+                    query_filters = None
+                cache_key = (self.catalog_version.value, self.normalize_query(query), n_results, query_filters)
+                cached = self.search_result_cache.get(cache_key)
+                if cached is not None:
+                    results[index] = list(cached)
+                elif cache_key in pending:
+                    pending[cache_key][2].append(index)
+                else:
+                    pending[cache_key] = (query, query_filters, [index])
             
-            products = []
-            if results['metadatas'] and len(results['metadatas']) > 0:
-                for metadata in results['metadatas'][0]:
-                    # Parse JSON fields back to Python objects
-                    features = json.loads(metadata.get('features', '[]'))
-                    additional_attributes = json.loads(metadata.get('additional_attributes', '{}'))
-                    
-                    product = {
-                        "title": metadata.get('title'),
-                        "price": metadata.get('price'),
-                        "description": metadata.get('description'),
-                        "image_url": metadata.get('image_url'),
-                        "category": metadata.get('category'),
-                        "brand": metadata.get('brand'),
-                        "availability": metadata.get('availability'),
-                        "product_url": metadata.get('product_url'),
-                        "features": features,
-                        "additional_attributes": additional_attributes
-                    }
-                    products.append(product)
+            hybrid = self.search_mode == "hybrid"
+            if pending and hybrid:
+                self._refresh_indexes()
             
-            return products
+            def finish(cache_key, products):
+                self.search_result_cache.set(cache_key, products)
+                for index in pending[cache_key][2]:
+                    results[index] = list(products)
+            
+            dense = []
+            for cache_key, (query, query_filters, _) in pending.items():
+                where = query_filters.to_where() if query_filters else None
+                if hybrid and self.lexical_fast_path and is_keyword_query(query) and self.lexical_index.covers(tokenize(query)):
+                    lexical_ids, metadata_by_id = self._lexical_ranking(query, n_results, where)
+                    if len(lexical_ids) >= n_results:
+                        self.fast_path_hits += 1
+                        finish(cache_key, self._products_by_ids(lexical_ids, metadata_by_id))
+                        continue
+                dense.append(cache_key)
+            
+            if dense:
+                candidates = max(n_results, self.hybrid_candidates) if hybrid else n_results
+                query_embeddings = self.embed_queries([pending[cache_key][0] for cache_key in dense])
+                
+                # The backend applies one where clause per call, so group queries by filters
+                groups: Dict[Optional[SearchFilters], List[int]] = {}
+                for row, cache_key in enumerate(dense):
+                    groups.setdefault(pending[cache_key][1], []).append(row)
+                
+                for query_filters, rows in groups.items():
+                    where = query_filters.to_where() if query_filters else None
+                    response = self.backend.query(
+                        query_embeddings=query_embeddings[rows],
+                        n_results=candidates,
+                        where=where
+                    )
+                    for row, ids, metadatas in zip(rows, response['ids'], response['metadatas']):
+                        query = pending[dense[row]][0]
+                        dense_metadata = dict(zip(ids, metadatas))
+                        if hybrid:
+                            lexical_ids, metadata_by_id = self._lexical_ranking(query, candidates, where)
+                            metadata_by_id.update(dense_metadata)
+                            ranked_ids = reciprocal_rank_fusion([list(dense_metadata), lexical_ids])[:n_results]
+                        else:
+                            metadata_by_id = dense_metadata
+                            ranked_ids = list(dense_metadata)
+                        finish(dense[row], self._products_by_ids(ranked_ids, metadata_by_id))
+            
+            return [products if products is not None else [] for products in results]
             
         except Exception as e:
             logger.error(f"Error searching products: {e}")
-            return []
+            return [[] for _ in queries]
+    
+    def _lexical_ranking(self, query: str, k: int, where: Optional[Dict[str, Any]]):
+        """Top ``k`` BM25 IDs that satisfy ``where``, plus any metadata fetched to check them"""
+        if where is None:
+            return [doc_id for doc_id, _ in self.lexical_index.search(query, k)], {}
+        
+        # The inverted index knows nothing about metadata, so over-fetch and let the backend filter
+        hits = [doc_id for doc_id, _ in self.lexical_index.search(query, k * self.filter_oversample)]
+        if not hits:
+            return [], {}
+        fetched = self.backend.get(ids=hits, where=where, include=["metadatas"])
+        metadata_by_id = dict(zip(fetched["ids"], fetched["metadatas"]))
+        return [doc_id for doc_id in hits if doc_id in metadata_by_id][:k], metadata_by_id
+    
+    def _products_by_ids(self, ids: List[str], metadata_by_id: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """Products for vector IDs, in the given order, fetching metadata not already known"""
+        metadata_by_id = dict(metadata_by_id or {})
+        missing = [vector_id for vector_id in ids if vector_id not in metadata_by_id]
+        if missing:
+            fetched = self.backend.get(ids=missing, include=["metadatas"])
+            metadata_by_id.update(zip(fetched["ids"], fetched["metadatas"]))
+        
+        # Lean metadata has no title; those products are joined from SQL,
+        # and dropped if they were deleted there
+        sql_products = self._load_sql_products(
+            [vector_id for vector_id in ids if vector_id in metadata_by_id and "title" not in metadata_by_id[vector_id]]
+        )
+        products = []
+        for vector_id in ids:
+            if vector_id in sql_products:
+                products.append(sql_products[vector_id])
+            elif vector_id in metadata_by_id and "title" in metadata_by_id[vector_id]:
+                products.append(self._metadata_to_product(vector_id, metadata_by_id[vector_id]))
+        return products
+    
+    @staticmethod
+    def _load_sql_products(vector_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Products from the products table for numeric vector IDs, keyed by vector ID"""
+        product_ids = [int(vector_id) for vector_id in vector_ids if vector_id.isdigit()]
+        if not product_ids:
+            return {}
+        
+        with SessionLocal() as db:
+            rows = db.query(Product).filter(Product.id.in_(product_ids)).all()
+            products = {}
+            for row in rows:
+                product = row.to_dict()
+                products[str(row.id)] = {
+                    "id": row.id,
+                    **{field: product.get(field) for field in PRODUCT_FIELDS},
+                    "features": product.get("features") or [],
+                    "additional_attributes": product.get("additional_attributes") or {}
+                }
+            return products
+    
+    @staticmethod
+    def _metadata_to_product(vector_id: str, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        # Parse JSON fields back to Python objects
+        features = json.loads(metadata.get('features', '[]'))
+        additional_attributes = json.loads(metadata.get('additional_attributes', '{}'))
+        
+        return {
+            "id": int(vector_id) if vector_id.isdigit() else vector_id,
+            "title": metadata.get('title'),
+            "price": metadata.get('price'),
+            "description": metadata.get('description'),
+            "image_url": metadata.get('image_url'),
+            "category": metadata.get('category'),
+            "brand": metadata.get('brand'),
+            "availability": metadata.get('availability'),
+            "product_url": metadata.get('product_url'),
+            "features": features,
+            "additional_attributes": additional_attributes
+        }
     
     def get_collection_count(self) -> int:
         """Get the number of products in the collection"""
         try:
-            return self.collection.count()
+            return self.backend.count()
         except Exception as e:
             logger.error(f"Error getting collection count: {e}")
-            return 0
\ No newline at end of file
+            return 0
+
+def product_vector_id(product: Dict[str, Any]) -> str:
+    """Deterministic vector ID for a product.
+
+    Products stored in SQL use their ``Product.id``. Products without one get a
+    digest of their URL (or title) so the ID is the same in every process,
+    unlike the per-process salted ``hash()``.
+    """
+    if product.get('id') is not None:
+        return str(product['id'])
+    if product.get('product_url'):
+        return "url-" + hashlib.sha1(product['product_url'].encode("utf-8")).hexdigest()
+    title = " ".join((product.get('title') or '').lower().split())
+    return "title-" + hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+_vector_service = None
+_vector_service_lock = threading.Lock()
+
+def get_vector_service() -> VectorService:
+    """Return the process-wide VectorService, creating it on first call.
+
+    Also usable as a FastAPI dependency so every router shares one model
+    and one vector backend per worker process.
+    """
+    global _vector_service
+    if _vector_service is None:
+        with _vector_service_lock:
+            if _vector_service is None:
+                _vector_service = VectorService()
+    return _vector_service
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Batch search benchmark: one search_products call per query vs search_many.
+
+Indexes the sample catalog plus synthetic products into throwaway storage
+(VECTOR_BACKEND picks the backend, Chroma by default), then searches the
+same --queries distinct natural-language queries:
+  1. one search_products call per query, as a loop over GET /search/{query} does
+  2. search_many in chunks of --batch-size queries, as POST /search/batch does
+Result and embedding caches are cleared before every run, so both pay for
+encoding every query. Prints queries/sec for each in vector and hybrid mode,
+and the share of queries whose results are identical. Scores computed as one
+matrix product can round differently from single queries, so products with
+tied scores (common among the near-identical synthetic ones) may swap places.
+
+Usage:
+    python benchmarks/batch_search.py [--synthetic 2000] [--queries 1000] [--batch-size 256] [--n-results 10]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from itertools import product as combinations
+from pathlib import Path
+
+os.environ.setdefault("CHROMA_PERSIST_DIRECTORY", tempfile.mkdtemp())
+os.environ.setdefault("NUMPY_VECTOR_DIRECTORY", tempfile.mkdtemp())
+os.environ.setdefault("QUANTIZED_VECTOR_DIRECTORY", tempfile.mkdtemp())
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.vector_service import VectorService
+from ingest_throughput import make_products
+
+ADJECTIVES = ["comfortable", "modern", "wooden", "compact", "premium", "minimal", "sturdy", "cozy"]
+ITEMS = ["sofa", "queen bed", "dining table", "wardrobe", "study desk", "bookshelf", "recliner", "coffee table"]
+PLACES = ["for a small flat", "for the living room", "for guests", "for kids", "for a home office", "with storage"]
+
+def make_queries(count):
+    templates = [f"{adjective} {item} {place}" for adjective, item, place in combinations(ADJECTIVES, ITEMS, PLACES)]
+    # Past the distinct templates, a numeric suffix keeps every query (and its embedding) unique
+    return [templates[i % len(templates)] + (f" {i // len(templates)}" if i >= len(templates) else "") for i in range(count)]
+
+def timed(service, search):
+    service.search_result_cache.clear()
+    service.query_embedding_cache.clear()
+    start = time.perf_counter()
+    results = search()
+    return time.perf_counter() - start, results
+
+def main(args):
+    sample = json.loads((Path(__file__).resolve().parent.parent / "sample_data" / "products_fallback.json").read_text())
+    products = sample + [dict(product, id=100000 + i) for i, product in enumerate(make_products(args.synthetic))]
+
+    service = VectorService()
+    service.warm_up()
+    service.add_products(products)
+    queries = make_queries(args.queries)
+    print(f"{service.backend.name} backend, {service.get_collection_count()} products, {len(queries)} queries")
+
+    for mode in ("vector", "hybrid"):
+        service.search_mode = mode
+        looped, single = timed(service, lambda: [service.search_products(query, args.n_results) for query in queries])
+        batched, many = timed(service, lambda: [
+            results
+            for begin in range(0, len(queries), args.batch_size)
+            for results in service.search_many(queries[begin:begin + args.batch_size], args.n_results)
+        ])
+        print(
+            f"  {mode:<7} per query {len(queries) / looped:8.1f} q/s   "
+            f"search_many {len(queries) / batched:8.1f} q/s   "
+            f"speedup {looped / batched:5.1f}x   identical {sum(a == b for a, b in zip(single, many)) / len(queries):.0%}"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--n-results", type=int, default=10)
+    main(parser.parse_args())
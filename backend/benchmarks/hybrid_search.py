@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Hybrid search benchmark: dense-only vs BM25 + vector fusion vs keyword fast path.
+
+Indexes the sample catalog plus synthetic products into a throwaway Chroma
+directory, then times VectorService.search_products for keyword and
+natural-language queries in each mode. Result and embedding caches are
+cleared before every query, so each one pays the full cost. Also prints the
+top titles per mode so the rankings can be compared.
+
+Usage:
+    python benchmarks/hybrid_search.py [--synthetic 2000] [--n-results 5] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("CHROMA_PERSIST_DIRECTORY", tempfile.mkdtemp())
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.vector_service import VectorService
+from ingest_throughput import make_products
+
+QUERIES = [
+    "queen bed",
+    "3 door wardrobe",
+    "coffee table",
+    "comfortable sofa for a small living room",
+    "something to store clothes in the bedroom"
+]
+
+MODES = {
+    "vector": {"search_mode": "vector", "lexical_fast_path": False},
+    "hybrid": {"search_mode": "hybrid", "lexical_fast_path": False},
+    "hybrid+fast path": {"search_mode": "hybrid", "lexical_fast_path": True}
+}
+
+def run_query(service, query, n_results, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        service.search_result_cache.clear()
+        service.query_embedding_cache.clear()
+        results = service.search_products(query, n_results)
+    return (time.perf_counter() - start) / repeat * 1000, results
+
+def main(args):
+    sample = json.loads((Path(__file__).resolve().parent.parent / "sample_data" / "products_fallback.json").read_text())
+    products = sample + [dict(product, id=100000 + i) for i, product in enumerate(make_products(args.synthetic))]
+
+    service = VectorService()
+    service.warm_up()
+    service.add_products(products)
+    print(f"indexed {service.get_collection_count()} products, {service.lexical_index.stats()['terms']} terms")
+
+    for query in QUERIES:
+        print(f"\n{query!r}")
+        for name, settings in MODES.items():
+            for attribute, value in settings.items():
+                setattr(service, attribute, value)
+            hits_before = service.fast_path_hits
+            ms, results = run_query(service, query, args.n_results, args.repeat)
+            fast = " (fast path)" if service.fast_path_hits > hits_before else ""
+            titles = ", ".join(product["title"] for product in results[:3])
+            print(f"  {name:<17} {ms:8.2f} ms{fast}: {titles}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--synthetic", type=int, default=2000)
+    parser.add_argument("--n-results", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=20)
+    main(parser.parse_args())
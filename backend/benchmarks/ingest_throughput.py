@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Product ingestion benchmark: per-row existence checks vs bulk upsert.
+
+Loads synthetic products into a fresh database and prints rows/sec for:
+  1. the old path: one SELECT by title and one db.add per product
+  2. bulk_upsert_products into an empty table
+  3. bulk_upsert_products again with nothing changed
+  4. bulk_upsert_products with every tenth price changed
+
+The old path is measured on a subset (--legacy-rows) because it does not
+scale. Defaults to a throwaway SQLite file; pass --database-url to use Postgres.
+
+Usage:
+    python benchmarks/ingest_throughput.py [--rows 50000] [--legacy-rows 2000] [--chunk-size 1000] [--database-url URL]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+from app.models.product import Base, Product
+from app.services.product_ingest import bulk_upsert_products
+
+def make_products(count):
+    return [{
+        "title": f"Product {i}",
+        "price": float(1000 + i % 5000),
+        "description": f"Synthetic product number {i} for the ingestion benchmark.",
+        "features": [f"Feature {j}" for j in range(i % 5)],
+        "image_url": f"https://example.com/images/{i}.jpg",
+        "category": ["Bedroom", "Living Room", "Dining Room", "Study Room"][i % 4],
+        "brand": "Furlenco",
+        "availability": "Available",
+        "product_url": f"https://example.com/product/{i}",
+        "additional_attributes": {"sku": i}
+    } for i in range(count)]
+
+def legacy_ingest(session, products):
+    start = time.perf_counter()
+    for product_data in products:
+        existing = session.query(Product).filter(Product.title == product_data['title']).first()
+        if not existing:
+            session.add(Product(**product_data))
+    session.commit()
+    return time.perf_counter() - start
+
+def main(args):
+    database_url = args.database_url or f"sqlite:///{tempfile.mkdtemp()}/ingest.db"
+    engine = create_engine(database_url)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    products = make_products(args.rows)
+    
+    with Session() as session:
+        session.execute(delete(Product))
+        session.commit()
+        
+        elapsed = legacy_ingest(session, products[:args.legacy_rows])
+        print(f"{'per-row (legacy)':>22}: {args.legacy_rows / elapsed:10.0f} rows/s ({args.legacy_rows} rows in {elapsed:.2f}s)")
+        session.execute(delete(Product))
+        session.commit()
+        
+        for label, batch in [
+            ("bulk, empty table", products),
+            ("bulk, unchanged", products),
+            ("bulk, 10% changed", [dict(p, price=p["price"] + 1) if i % 10 == 0 else p for i, p in enumerate(products)])
+        ]:
+            stats = bulk_upsert_products(session, batch, key="title", chunk_size=args.chunk_size)
+            print(f"{label:>22}: {stats['rows_per_sec']:10.0f} rows/s ({stats['rows']} rows in {stats['seconds']:.2f}s, "
+                  f"{stats['inserted']} inserted, {stats['updated']} updated, {stats['unchanged']} unchanged)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--legacy-rows", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--database-url", help="defaults to a temporary SQLite database")
+    main(parser.parse_args())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Local OpenAI-compatible stub for benchmarking the LLM client without network access.
+
+Serves POST /v1/chat/completions with a fixed recommendation after an
+artificial delay (streamed in small chunks when "stream" is set), and
+GET /stats with the number of completions served.
+
+Usage:
+    python benchmarks/llm_stub_server.py [--port 8100] [--latency 0.5]
+    OPENAI_API_KEY=stub OPENAI_BASE_URL=http://localhost:8100/v1 uvicorn app.main:app
+"""
+import argparse
+import asyncio
+import json
+import re
+import time
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+app = FastAPI(title="LLM stub")
+app.state.latency = 0.5
+app.state.completions = 0
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: Request):
+    body = await request.json()
+    app.state.completions += 1
+    await asyncio.sleep(app.state.latency)
+    
+    # Recommend the first two numbered products listed in the prompt
+    prompt = body["messages"][-1]["content"]
+    titles = re.findall(r"^\d+\. (.+)$", prompt, flags=re.MULTILINE)[:2]
+    content = json.dumps({
+        "response_type": "recommendation",
+        "message": "Here are a couple of options that match what you described.",
+        "recommended_products": titles,
+        "clarifying_questions": []
+    })
+    if body.get("stream"):
+        return StreamingResponse(stream_chunks(content, body.get("model", "stub")), media_type="text/event-stream")
+    return {
+        "id": f"chatcmpl-stub-{app.state.completions}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "stub"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    }
+
+async def stream_chunks(content: str, model: str, chunk_size: int = 8):
+    for start in range(0, len(content), chunk_size):
+        chunk = {
+            "id": f"chatcmpl-stub-{app.state.completions}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "delta": {"content": content[start:start + chunk_size]}, "finish_reason": None}]
+        }
+        yield f"data: {json.dumps(chunk)}\n\n"
+        await asyncio.sleep(0.01)
+    yield "data: [DONE]\n\n"
+
+@app.get("/stats")
+async def stats():
+    return {"completions": app.state.completions}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", type=float, default=0.5, help="seconds per completion")
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+LLM client throughput benchmark against the local stub server.
+
+Fires --requests concurrent recommendation calls spread over --distinct
+queries and reports requests/sec, upstream calls (coalesced duplicates
+share one) and latency percentiles. With --cache the persistent response
+cache is enabled, so a second run is served without upstream calls.
+
+Usage:
+    python benchmarks/llm_stub_server.py --latency 0.5 &
+    python benchmarks/llm_throughput.py [--base-url http://127.0.0.1:8100/v1] [--requests 200] [--distinct 20] [--cache]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.llm_service import LLMService
+from app.scraper.furlenco_scraper import get_fallback_furlenco_products
+
+async def timed(coro):
+    start = time.perf_counter()
+    await coro
+    return (time.perf_counter() - start) * 1000
+
+async def main(args):
+    os.environ.update({
+        "OPENAI_API_KEY": os.getenv("OPENAI_API_KEY") or "stub",
+        "OPENAI_BASE_URL": args.base_url,
+        "LLM_TIMEOUT_SECONDS": str(args.timeout),
+        "LLM_CONCURRENCY": str(args.concurrency),
+        "LLM_MAX_CONNECTIONS": str(args.concurrency),
+        "LLM_CACHE_ENABLED": "true" if args.cache else "false"
+    })
+    service = LLMService()
+    products = get_fallback_furlenco_products()
+    queries = [f"furniture idea number {i}" for i in range(args.distinct)]
+    
+    start = time.perf_counter()
+    latencies = await asyncio.gather(*[
+        timed(service.interpret_query_and_recommend(queries[i % len(queries)], products))
+        for i in range(args.requests)
+    ])
+    elapsed = time.perf_counter() - start
+    stats = service.get_stats()
+    await service.aclose()
+    
+    ordered = sorted(latencies)
+    print(f"requests:        {args.requests} ({args.distinct} distinct)")
+    print(f"throughput:      {args.requests / elapsed:.1f} req/s")
+    print(f"upstream calls:  {stats['upstream_calls']} (coalesced {stats['coalesced_calls']}, timeouts {stats['timeouts']})")
+    if stats["response_cache"]:
+        print(f"cache hits:      {stats['response_cache']['hits']}")
+    print(f"latency:         p50={statistics.median(ordered):.0f}ms p99={ordered[int(0.99 * (len(ordered) - 1))]:.0f}ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default=os.getenv("OPENAI_BASE_URL", "http://127.0.0.1:8100/v1"))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--distinct", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--timeout", type=float, default=15.0)
+    parser.add_argument("--cache", action="store_true", help="enable the persistent response cache")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Load test: latency of GET /api/products while chat requests are in flight.
+
+Runs a baseline pass of catalog requests, then repeats it while a steady
+stream of POST /api/chat/ requests is running, and prints p50/p99 for both.
+With the chat stages offloaded from the event loop, the two should match.
+
+Usage:
+    python benchmarks/load_test.py [--url http://localhost:8000] [--requests 200] [--chat-concurrency 16]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+CHAT_QUERIES = [
+    "comfortable sofa for a small living room",
+    "queen bed with storage",
+    "study table for working from home",
+    "dining set for four people",
+    "wardrobe with mirror",
+]
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+async def measure_products(client: httpx.AsyncClient, count: int):
+    latencies = []
+    for _ in range(count):
+        start = time.perf_counter()
+        response = await client.get("/api/products/", params={"limit": 20})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+async def chat_load(client: httpx.AsyncClient, stop: asyncio.Event, counter: list):
+    i = 0
+    while not stop.is_set():
+        await client.post("/api/chat/", json={"message": CHAT_QUERIES[i % len(CHAT_QUERIES)]})
+        counter[0] += 1
+        i += 1
+
+def report(label, latencies):
+    print(f"{label:>22}: p50={statistics.median(latencies):7.1f}ms  "
+          f"p99={percentile(latencies, 99):7.1f}ms  max={max(latencies):7.1f}ms")
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.chat_concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.url, timeout=120, limits=limits) as client:
+        baseline = await measure_products(client, args.requests)
+        
+        stop = asyncio.Event()
+        chats_done = [0]
+        chat_tasks = [asyncio.create_task(chat_load(client, stop, chats_done))
+                      for _ in range(args.chat_concurrency)]
+        # Give the chat requests a moment to reach the search/LLM stages
+        await asyncio.sleep(0.5)
+        loaded = await measure_products(client, args.requests)
+        stop.set()
+        await asyncio.gather(*chat_tasks, return_exceptions=True)
+    
+    report("products (idle)", baseline)
+    report("products (chat load)", loaded)
+    print(f"{'chat requests':>22}: {chats_done[0]} completed during the loaded pass")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--chat-concurrency", type=int, default=16)
+    asyncio.run(main(parser.parse_args()))
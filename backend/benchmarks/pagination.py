@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pagination benchmark: offset vs keyset (cursor) pages of GET /api/products.
+
+Fills a throwaway SQLite database with synthetic products, then times
+fetching a page at increasing depths with ?skip= and with ?cursor= through
+the FastAPI app, and checks that walking all pages by cursor visits every
+product exactly once.
+
+Usage:
+    python benchmarks/pagination.py [--rows 50000] [--limit 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/pagination.db")
+os.environ.setdefault("VECTOR_WARMUP", "false")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.api.products import _encode_cursor
+from app.services.product_ingest import bulk_upsert_products
+from ingest_throughput import make_products
+
+def timed_get(client, params, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = client.get("/api/products/", params=params)
+    return (time.perf_counter() - start) / repeat * 1000, response
+
+def main(args):
+    with SessionLocal() as db:
+        bulk_upsert_products(db, make_products(args.rows))
+    
+    with TestClient(app) as client:
+        for depth in (0, args.rows // 10, args.rows // 2, args.rows - args.limit):
+            offset_ms, _ = timed_get(client, {"skip": depth, "limit": args.limit})
+            # Product ids start at 1, so the cursor after id=depth starts at the same row
+            cursor_ms, _ = timed_get(client, {"cursor": _encode_cursor(depth), "limit": args.limit})
+            print(f"depth {depth:>7}: offset {offset_ms:7.2f} ms, cursor {cursor_ms:7.2f} ms")
+        
+        seen, cursor = [], None
+        while True:
+            params = {"limit": 1000}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/products/", params=params)
+            seen.extend(product["id"] for product in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        print(f"cursor walk: {len(seen)} products, {len(set(seen))} unique")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--limit", type=int, default=50)
+    main(parser.parse_args())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+HTML parsing benchmark for scraper product pages.
+
+Parses a set of saved HTML pages three ways and prints pages/sec:
+  1. single-threaded with html.parser (the original scraper path)
+  2. single-threaded with lxml
+  3. lxml in a process pool, as the crawl engine does
+
+Usage:
+    python benchmarks/parse_throughput.py [--fixtures DIR] [--pages 300] [--workers N]
+
+DIR should contain saved product pages (*.html). Without it, synthetic
+pages from scraper_fixtures.py are used.
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scraper.parsing import parse_product_html
+from scraper_fixtures import CATEGORIES, product_page, product_slug
+
+BASE_URL = "https://furlenco.com"
+
+def load_pages(fixtures_dir, count):
+    if fixtures_dir:
+        files = sorted(Path(fixtures_dir).glob("*.html"))
+        if not files:
+            sys.exit(f"No *.html files in {fixtures_dir}")
+        pages = [(f"{BASE_URL}/product/{f.stem}", f.read_bytes()) for f in files]
+    else:
+        slugs = [product_slug(c, i) for c in CATEGORIES for i in range(20)]
+        pages = [(f"{BASE_URL}/product/{slug}", product_page(slug).encode()) for slug in slugs]
+    # Repeat the fixture set up to the requested page count
+    return [pages[i % len(pages)] for i in range(count)]
+
+def parse_one(args):
+    url, html, parser = args
+    return parse_product_html(html, url, BASE_URL, parser)
+
+def run_serial(pages, parser):
+    start = time.perf_counter()
+    results = [parse_product_html(html, url, BASE_URL, parser) for url, html in pages]
+    return results, time.perf_counter() - start
+
+def run_pool(pages, parser, workers):
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Warm the pool so process start-up is not counted
+        list(pool.map(parse_one, [(pages[0][0], pages[0][1], parser)] * workers))
+        start = time.perf_counter()
+        results = list(pool.map(parse_one, [(url, html, parser) for url, html in pages], chunksize=4))
+        return results, time.perf_counter() - start
+
+def main(args):
+    pages = load_pages(args.fixtures, args.pages)
+    size_kb = sum(len(html) for _, html in pages) / len(pages) / 1024
+    print(f"{len(pages)} pages, {size_kb:.0f} KB average")
+    
+    baseline, elapsed = run_serial(pages, "html.parser")
+    print(f"{'html.parser, 1 thread':>26}: {len(pages) / elapsed:8.1f} pages/s")
+    
+    results, elapsed = run_serial(pages, "lxml")
+    print(f"{'lxml, 1 thread':>26}: {len(pages) / elapsed:8.1f} pages/s")
+    
+    results, elapsed = run_pool(pages, "lxml", args.workers)
+    print(f"{f'lxml, {args.workers} processes':>26}: {len(pages) / elapsed:8.1f} pages/s")
+    
+    mismatches = sum(1 for a, b in zip(baseline, results) if a != b)
+    print(f"extraction differences vs html.parser: {mismatches}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", help="directory of saved product pages")
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    main(parser.parse_args())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Quantized vector store benchmark: index size and recall loss per encoding.
+
+Loads the same synthetic clustered embeddings (MiniLM-sized, 384 dims) into
+the numpy backend (float32, float16) and the quantized backend (int8, PQ),
+then reports for each:
+  - MB scanned per query and MB on disk per million vectors
+  - recall@k against exact float64 brute force, without re-ranking
+    (--rerank 1) and with the exact re-rank of the shortlist
+  - single-query QPS
+
+It also reports the metadata stored per product for the sample catalog with
+VECTOR_METADATA=full and VECTOR_METADATA=sql.
+
+Usage:
+    python benchmarks/quantized_store.py [--rows 50000] [--queries 200] [--k 10] [--rerank 8]
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.vector_backends import NumpyBackend, QuantizedBackend
+from app.services.vector_service import VectorService
+from vector_backends import load, make_embeddings, recall_at_k
+
+MILLION = 1_000_000
+
+def directory_bytes(directory):
+    return sum(path.stat().st_size for path in Path(directory).iterdir() if path.suffix == ".npy")
+
+def run_queries(backend, queries, k):
+    start = time.perf_counter()
+    results = {"ids": []}
+    for query in queries:
+        results["ids"].extend(backend.query(query[np.newaxis], k)["ids"])
+    return results, len(queries) / (time.perf_counter() - start)
+
+def metadata_bytes(products, mode):
+    service = VectorService()
+    service.metadata_mode = mode
+    sizes = []
+    for product in products:
+        metadata = service._product_metadata(product)
+        metadata["content_hash"] = service.content_hash(service.create_product_text(product))
+        document = "" if service._joins_sql(service._product_id(product)) else service.create_product_text(product)
+        sizes.append(len(json.dumps(metadata)) + len(document.encode("utf-8")))
+    return sum(sizes) / len(sizes)
+
+def main(args):
+    rng = np.random.default_rng(42)
+    embeddings = make_embeddings(args.rows, args.dim, args.clusters, rng)
+    queries = make_embeddings(args.queries, args.dim, args.clusters, rng)
+    truth = np.argsort(-(queries.astype(np.float64) @ embeddings.astype(np.float64).T), axis=1)[:, :args.k]
+
+    backends = {
+        "float32": lambda directory: NumpyBackend(directory, dtype="float32"),
+        "float16": lambda directory: NumpyBackend(directory, dtype="float16"),
+        "int8": lambda directory: QuantizedBackend(directory, mode="int8", rerank_factor=args.rerank),
+        "pq 48": lambda directory: QuantizedBackend(directory, mode="pq", pq_subspaces=48, rerank_factor=args.rerank),
+        "pq 96": lambda directory: QuantizedBackend(directory, mode="pq", pq_subspaces=96, rerank_factor=args.rerank)
+    }
+
+    print(f"{args.rows} vectors x {args.dim} dims, {args.queries} queries, k={args.k}, rerank factor {args.rerank}")
+    print(f"{'':<8} {'scan MB/1M':>10} {'disk MB/1M':>10} {'recall':>7} {'reranked':>8} {'q/s':>8}")
+    for name, factory in backends.items():
+        directory = tempfile.mkdtemp()
+        backend = factory(directory)
+        load(backend, embeddings)
+        stats = backend.stats()
+        scanned = stats.get("scanned_bytes_per_vector", stats["matrix_bytes"] / stats["count"])
+
+        if isinstance(backend, QuantizedBackend):
+            backend.rerank_factor = 1
+            approximate, _ = run_queries(backend, queries, args.k)
+            backend.rerank_factor = args.rerank
+            approximate_recall = f"{recall_at_k(approximate, truth, args.k):7.3f}"
+        else:
+            approximate_recall = f"{'exact':>7}"
+        results, qps = run_queries(backend, queries, args.k)
+
+        print(
+            f"{name:<8} {scanned * MILLION / 2**20:10.0f} {directory_bytes(directory) / args.rows * MILLION / 2**20:10.0f} "
+            f"{approximate_recall} {recall_at_k(results, truth, args.k):8.3f} {qps:8.1f}"
+        )
+
+    products = json.loads((Path(__file__).resolve().parent.parent / "sample_data" / "products_fallback.json").read_text())
+    full, lean = metadata_bytes(products, "full"), metadata_bytes(products, "sql")
+    print(f"\nstored text + metadata per product ({len(products)} sample products): "
+          f"full {full:.0f} bytes, sql {lean:.0f} bytes ({full * MILLION / 2**20:.0f} vs {lean * MILLION / 2**20:.0f} MB per 1M)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--rerank", type=int, default=8)
+    main(parser.parse_args())
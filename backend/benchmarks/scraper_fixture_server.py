@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Local HTTP server that mimics Furlenco category and product pages.
+
+Lets the scraper be benchmarked without touching furlenco.com. Optional
+per-response latency simulates a remote site. Pages carry an ETag and
+conditional requests with a matching If-None-Match get 304 Not Modified.
+
+Usage:
+    python benchmarks/scraper_fixture_server.py [--port 8200] [--latency 0.05] [--products-per-category 20]
+"""
+import argparse
+import asyncio
+import hashlib
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import HTMLResponse, Response
+from scraper_fixtures import CATEGORIES, listing_page, product_page
+
+app = FastAPI(title="Scraper fixtures")
+app.state.latency = 0.0
+app.state.products_per_category = 20
+app.state.requests = 0
+app.state.not_modified = 0
+
+def _conditional(request: Request, html: str) -> Response:
+    etag = '"' + hashlib.sha1(html.encode("utf-8")).hexdigest() + '"'
+    if request.headers.get("if-none-match") == etag:
+        app.state.not_modified += 1
+        return Response(status_code=304, headers={"ETag": etag})
+    return HTMLResponse(html, headers={"ETag": etag})
+
+@app.get("/bangalore/categories/{category}")
+async def category_page(category: str, request: Request):
+    if category not in CATEGORIES:
+        raise HTTPException(status_code=404)
+    app.state.requests += 1
+    await asyncio.sleep(app.state.latency)
+    return _conditional(request, listing_page(category, app.state.products_per_category))
+
+@app.get("/product/{slug}")
+async def product(slug: str, request: Request):
+    app.state.requests += 1
+    await asyncio.sleep(app.state.latency)
+    return _conditional(request, product_page(slug))
+
+@app.get("/stats")
+async def stats():
+    return {"requests": app.state.requests, "not_modified": app.state.not_modified}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8200)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per response")
+    parser.add_argument("--products-per-category", type=int, default=20)
+    args = parser.parse_args()
+    app.state.latency = args.latency
+    app.state.products_per_category = args.products_per_category
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,55 @@
+"""
+Synthetic Furlenco-like HTML pages for scraper benchmarks.
+
+Pages use the same selectors FurlencoScraper looks for, padded with enough
+markup to be comparable in size to a real product page.
+"""
+import random
+
+CATEGORIES = ["bedroom", "living-room", "dining-room", "study-room", "storage", "home-decor"]
+
+FILLER = "".join(
+    f'<div class="recommendation"><a href="/related/{i}"><span>Related item {i}</span></a>'
+    f'<p>Free delivery and installation within 72 hours.</p></div>'
+    for i in range(150)
+)
+
+def product_slug(category: str, index: int) -> str:
+    return f"{category}-item-{index}"
+
+def listing_page(category: str, products_per_category: int) -> str:
+    cards = "".join(
+        f'<div class="product-card"><a href="/product/{product_slug(category, i)}">'
+        f'<span>{category.title()} item {i}</span></a></div>'
+        for i in range(products_per_category)
+    )
+    return f"<html><head><title>{category}</title></head><body><main>{cards}</main>{FILLER}</body></html>"
+
+def product_page(slug: str) -> str:
+    rng = random.Random(slug)
+    category = slug.rsplit("-item-", 1)[0]
+    features = "".join(f"<li>Feature {i} of {slug}</li>" for i in range(rng.randint(3, 8)))
+    return f"""<html><head><title>{slug}</title></head><body>
+<nav class="breadcrumb"><a href="/">Home</a><a href="/bangalore/categories/{category}">{category.replace('-', ' ').title()}</a><a href="#">{slug}</a></nav>
+<div class="product-image"><img src="/images/{slug}.jpg"></div>
+<h1>{slug.replace('-', ' ').title()}</h1>
+<div class="price">&#8377; {rng.randint(2000, 40000):,}</div>
+<div class="product-description">{"Comfortable, durable and easy to maintain. " * 8}</div>
+<ul class="features">{features}</ul>
+{FILLER}
+</body></html>"""
+
+def product_page_alt(slug: str) -> str:
+    """Product page from a second template that only matches the lowest-priority selectors"""
+    rng = random.Random(slug)
+    category = slug.rsplit("-item-", 1)[0]
+    features = "".join(f"<li>Feature {i} of {slug}</li>" for i in range(rng.randint(3, 8)))
+    return f"""<html><head><title>{slug}</title></head><body>
+<nav data-testid="breadcrumb"><a href="/">Home</a><a href="/bangalore/categories/{category}">{category.replace('-', ' ').title()}</a><a href="#">{slug}</a></nav>
+<img data-testid="product-image" src="/images/{slug}.jpg">
+<div class="product-name">{slug.replace('-', ' ').title()}</div>
+<div class="current-price">&#8377; {rng.randint(2000, 40000):,}</div>
+<div data-testid="description">{"Comfortable, durable and easy to maintain. " * 8}</div>
+<ul class="product-features">{features}</ul>
+{FILLER}
+</body></html>"""
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Re-crawl benchmark for the scraper's on-disk HTTP cache.
+
+Runs three crawls against the local fixture server with a fresh cache
+directory: a cold crawl, a warm re-crawl (conditional requests, answered
+with 304 Not Modified) and an offline replay that never touches the network.
+Prints time, requests, bytes downloaded and unchanged pages for each.
+
+Usage:
+    python benchmarks/scraper_fixture_server.py --latency 0.05 &
+    python benchmarks/scraper_recrawl.py [--url http://127.0.0.1:8200] [--max-products 60] [--rate 20] [--workers 8]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scraper.furlenco_scraper import FurlencoScraper
+
+def crawl(label: str, base_url: str, max_products: int, offline: bool = False):
+    os.environ["SCRAPER_OFFLINE"] = "true" if offline else "false"
+    scraper = FurlencoScraper(base_url=base_url)
+    start = time.perf_counter()
+    products = asyncio.run(scraper.scrape_products_async(max_products))
+    elapsed = time.perf_counter() - start
+    stats = scraper.last_crawl_stats
+    print(f"{label:>8}: {len(products)} products in {elapsed:.2f}s, {stats['requests']} requests, "
+          f"{stats['bytes'] / 1024:.0f} KiB downloaded, {stats['not_modified']} not modified")
+    return products
+
+def main(args):
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ.update({
+            "SCRAPER_CONCURRENCY": str(args.workers),
+            "SCRAPER_RATE_PER_HOST": str(args.rate),
+            "SCRAPER_BURST": str(args.workers),
+            "SCRAPER_CACHE_ENABLED": "true",
+            "SCRAPER_CACHE_DIR": cache_dir
+        })
+        
+        cold = crawl("cold", args.url, args.max_products)
+        warm = crawl("warm", args.url, args.max_products)
+        offline = crawl("offline", args.url, args.max_products, offline=True)
+        
+        print(f"identical results: {cold == warm == offline}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8200")
+    parser.add_argument("--max-products", type=int, default=60)
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second per host")
+    parser.add_argument("--workers", type=int, default=8)
+    main(parser.parse_args())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Scraper throughput benchmark against the local fixture server.
+
+Compares the concurrent crawl engine with a sequential page-by-page crawl
+(the old loop, minus its fixed sleeps) and prints pages/sec for each.
+
+Usage:
+    python benchmarks/scraper_fixture_server.py --latency 0.05 &
+    python benchmarks/scraper_throughput.py [--url http://127.0.0.1:8200] [--max-products 60] [--rate 20] [--workers 8]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scraper.furlenco_scraper import FurlencoScraper, MAX_PRODUCTS_PER_CATEGORY
+
+def sequential_crawl(scraper: FurlencoScraper, max_products: int):
+    products, pages = [], 0
+    for category_url in scraper.get_category_urls():
+        if len(products) >= max_products:
+            break
+        product_urls = scraper.scrape_product_listing_page(category_url)
+        pages += 1
+        for product_url in product_urls[:MAX_PRODUCTS_PER_CATEGORY]:
+            if len(products) >= max_products:
+                break
+            product = scraper.scrape_product_details(product_url)
+            pages += 1
+            if product and product.get('title') and product.get('price') > 0:
+                products.append(product)
+    return products, pages
+
+def main(args):
+    logging.basicConfig(level=logging.WARNING)
+    os.environ.update({
+        "SCRAPER_CONCURRENCY": str(args.workers),
+        "SCRAPER_RATE_PER_HOST": str(args.rate),
+        "SCRAPER_BURST": str(args.workers),
+        # Measure real fetches; benchmarks/scraper_recrawl.py covers the page cache
+        "SCRAPER_CACHE_ENABLED": "false"
+    })
+    
+    scraper = FurlencoScraper(base_url=args.url)
+    start = time.perf_counter()
+    products, pages = sequential_crawl(scraper, args.max_products)
+    elapsed = time.perf_counter() - start
+    print(f"sequential: {len(products)} products, {pages} pages in {elapsed:.2f}s ({pages / elapsed:.1f} pages/s)")
+    
+    scraper = FurlencoScraper(base_url=args.url)
+    start = time.perf_counter()
+    products = asyncio.run(scraper.scrape_products_async(args.max_products))
+    elapsed = time.perf_counter() - start
+    pages = scraper.last_crawl_stats["requests"]
+    print(f"concurrent: {len(products)} products, {pages} pages in {elapsed:.2f}s ({pages / elapsed:.1f} pages/s, "
+          f"rate limit {args.rate}/s, {args.workers} workers)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8200")
+    parser.add_argument("--max-products", type=int, default=60)
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second per host")
+    parser.add_argument("--workers", type=int, default=8)
+    main(parser.parse_args())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Product extraction benchmark for the learned selector plan.
+
+For each page template, extracts the same pages three ways and prints
+pages/sec:
+  1. fixed default selector order (the original fallback chain)
+  2. learned order from a SelectorPlan trained on the pages
+  3. single pass: every selector matched in one DOM walk
+
+The "alt" template only matches the lowest-priority selectors, which is
+where a learned order pays off. Parsing uses lxml in a single thread.
+
+Usage:
+    python benchmarks/selector_plan_throughput.py [--pages 300]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.scraper.parsing import extract_product
+from app.scraper.selector_plan import SelectorPlan, page_template
+from scraper_fixtures import CATEGORIES, product_page, product_page_alt, product_slug
+
+BASE_URL = "https://furlenco.com"
+
+def run(pages, plan=None, single_pass=False):
+    start = time.perf_counter()
+    results = []
+    for url, html in pages:
+        order = plan.order(page_template(url)) if plan else None
+        extracted = extract_product(html, url, BASE_URL, "lxml", order, single_pass)
+        if plan:
+            plan.record(page_template(url), extracted["selectors"])
+        results.append(extracted["product"])
+    return results, time.perf_counter() - start
+
+def main(args):
+    slugs = [product_slug(c, i) for c in CATEGORIES for i in range(20)]
+    for name, render in [("default", product_page), ("alt", product_page_alt)]:
+        pages = [(f"{BASE_URL}/product/{slug}", render(slug).encode()) for slug in slugs]
+        pages = [pages[i % len(pages)] for i in range(args.pages)]
+        
+        baseline, elapsed = run(pages)
+        print(f"[{name}] {'fixed order':>12}: {len(pages) / elapsed:8.1f} pages/s")
+        
+        plan = SelectorPlan()
+        run(pages[:10], plan)
+        learned, elapsed = run(pages, plan)
+        print(f"[{name}] {'learned':>12}: {len(pages) / elapsed:8.1f} pages/s")
+        
+        single, elapsed = run(pages, single_pass=True)
+        print(f"[{name}] {'single pass':>12}: {len(pages) / elapsed:8.1f} pages/s")
+        
+        print(f"[{name}] identical results: {baseline == learned == single}")
+        fields = next(iter(plan.stats()["templates"].values()))["fields"]
+        print(f"[{name}] winning selectors: " + ", ".join(f"{f}={s['order'][0]}" for f, s in fields.items()))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=300)
+    main(parser.parse_args())
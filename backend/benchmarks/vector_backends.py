@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Vector backend benchmark: Chroma (HNSW) vs exact NumPy search, head to head.
+
+Loads the same synthetic clustered embeddings (MiniLM-sized, 384 dims) into
+each backend in a throwaway directory, then reports for each:
+  - load time
+  - recall@k against exact float64 brute force
+  - single-query QPS (one query per call, like search_products)
+  - batched QPS (--batch-size queries per call)
+
+The Chroma backend is skipped when chromadb is not installed.
+
+Usage:
+    python benchmarks/vector_backends.py [--rows 50000] [--queries 200] [--k 10] [--batch-size 64]
+"""
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.vector_backends import CHROMADB_AVAILABLE, ChromaBackend, NumpyBackend, normalize_rows
+
+def make_embeddings(rows, dim, clusters, rng):
+    # Products form clusters (categories, variants), which is what makes approximate search hard
+    centers = rng.standard_normal((clusters, dim))
+    assignment = rng.integers(0, clusters, rows)
+    return normalize_rows((centers[assignment] + 0.6 * rng.standard_normal((rows, dim))).astype(np.float32))
+
+def load(backend, embeddings, batch_size=5000):
+    start = time.perf_counter()
+    for begin in range(0, len(embeddings), batch_size):
+        end = min(begin + batch_size, len(embeddings))
+        ids = [str(i) for i in range(begin, end)]
+        backend.upsert(ids, embeddings[begin:end], [""] * len(ids), [{"price": float(i % 50000)} for i in range(begin, end)])
+    backend.persist()
+    return time.perf_counter() - start
+
+def recall_at_k(results, truth, k):
+    found = [len({int(doc_id) for doc_id in ids} & set(expected)) for ids, expected in zip(results["ids"], truth)]
+    return sum(found) / (len(truth) * k)
+
+def main(args):
+    rng = np.random.default_rng(42)
+    embeddings = make_embeddings(args.rows, args.dim, args.clusters, rng)
+    queries = make_embeddings(args.queries, args.dim, args.clusters, rng)
+    truth = np.argsort(-(queries.astype(np.float64) @ embeddings.astype(np.float64).T), axis=1)[:, :args.k]
+
+    backends = {}
+    if CHROMADB_AVAILABLE:
+        backends["chroma"] = lambda directory: ChromaBackend(directory, collection_name="benchmark")
+    else:
+        print("chromadb is not installed, skipping the chroma backend")
+    backends["numpy float32"] = lambda directory: NumpyBackend(directory, dtype="float32")
+    backends["numpy float16"] = lambda directory: NumpyBackend(directory, dtype="float16")
+
+    print(f"{args.rows} vectors x {args.dim} dims, {args.queries} queries, k={args.k}")
+    for name, factory in backends.items():
+        backend = factory(tempfile.mkdtemp())
+        load_seconds = load(backend, embeddings)
+
+        # One query at a time, as the chat endpoint does
+        start = time.perf_counter()
+        single = {"ids": []}
+        for query in queries:
+            single["ids"].extend(backend.query(query[np.newaxis], args.k)["ids"])
+        single_qps = len(queries) / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batched = {"ids": []}
+        for begin in range(0, len(queries), args.batch_size):
+            batched["ids"].extend(backend.query(queries[begin:begin + args.batch_size], args.k)["ids"])
+        batch_qps = len(queries) / (time.perf_counter() - start)
+
+        print(
+            f"{name:<14} load {load_seconds:7.2f}s  recall@{args.k} {recall_at_k(single, truth, args.k):.3f}  "
+            f"single {single_qps:8.1f} q/s  batched {batch_qps:8.1f} q/s"
+        )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=64)
+    main(parser.parse_args())
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Reconcile the vector index with the SQL product catalog.
+Removes orphaned and duplicate vectors and embeds any missing products.
+Run with --dry-run to only report what would change.
+"""
+import json
+import sys
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.database import SessionLocal
+from app.services.vector_service import get_vector_service
+from app.services.catalog_sync import reconcile_vector_index
+
+def reconcile(dry_run: bool = False) -> bool:
+    """Reconcile the vector index against the products table."""
+    db = SessionLocal()
+    try:
+        report = reconcile_vector_index(db, get_vector_service(), dry_run=dry_run)
+        print(json.dumps(report, indent=2))
+        
+        if dry_run:
+            print(f"🔎 Dry run: {report['orphaned']} orphaned vectors ({report['duplicates']} duplicates) would be removed")
+        else:
+            print(f"✅ Reconcile complete: {report['sync']['deleted']} vectors removed, {report['sync']['embedded']} embedded")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Reconcile failed: {e}")
+        return False
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    success = reconcile(dry_run="--dry-run" in sys.argv[1:])
+    sys.exit(0 if success else 1)
@@ -11,9 +11,10 @@ from pathlib import Path
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
-from app.models.product import Product, Base
+from app.database import create_db_engine
+from app.models.product import Base
+from app.services.product_ingest import bulk_upsert_products
 
 def load_fallback_data():
     """Load products from JSON file."""
@@ -30,52 +31,27 @@ def seed_database(database_url: str = None):
         print("❌ No DATABASE_URL provided. Skipping seed.")
         return False
     
-    # Handle Railway/Render postgres:// to postgresql://
-    if db_url.startswith('postgres://'):
-        db_url = db_url.replace('postgres://', 'postgresql://', 1)
-    
     try:
-        # Create engine and session
-        engine = create_engine(db_url)
+        # Create engine and session (same URL handling and pool settings as the API)
+        engine = create_db_engine(db_url)
         SessionLocal = sessionmaker(bind=engine)
         
         # Create tables if they don't exist
         Base.metadata.create_all(bind=engine)
         
-        # Load and insert products
+        # Load and insert products in bulk; ids already present are left alone,
+        # so a reseed never overwrites scraped or edited rows
         products_data = load_fallback_data()
         session = SessionLocal()
+        try:
+            stats = bulk_upsert_products(session, products_data, key="id", insert_only=True)
+        finally:
+            session.close()
         
-        inserted_count = 0
-        skipped_count = 0
-        
-        for product_dict in products_data:
-            # Check if product already exists
-            existing = session.query(Product).filter_by(id=product_dict['id']).first()
-            
-            if existing:
-                skipped_count += 1
-                continue
-            
-            # Create new product
-            product = Product(
-                id=product_dict['id'],
-                title=product_dict['title'],
-                price=product_dict['price'],
-                description=product_dict['description'],
-                features=product_dict['features'],
-                image_url=product_dict['image_url'],
-                category=product_dict['category'],
-                brand=product_dict['brand'],
-                availability=product_dict['availability']
-            )
-            session.add(product)
-            inserted_count += 1
-        
-        session.commit()
-        session.close()
-        
-        print(f"✅ Seed complete: {inserted_count} inserted, {skipped_count} skipped")
+        print(
+            f"✅ Seed complete: {stats['inserted']} inserted, {stats['skipped']} skipped "
+            f"({stats['rows_per_sec']:.0f} rows/s)"
+        )
         return True
         
     except Exception as e:
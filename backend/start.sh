@@ -5,6 +5,9 @@ echo "🚀 Starting Neusearch Backend..."
 
 # Run database migrations and seed
 if [ -n "$DATABASE_URL" ]; then
+    echo "🗄️  Applying database migrations..."
+    alembic upgrade head
+    
     echo "📦 Seeding database with demo products..."
     python seed_db.py "$DATABASE_URL" || echo "⚠️  Seed skipped or failed (non-fatal)"
 fi
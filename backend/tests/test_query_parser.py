@@ -0,0 +1,57 @@
+from app.services.query_parser import SearchFilters, parse_query
+
+CATEGORIES = ["Living Room", "Bedroom", "Room"]
+BRANDS = ["Furlenco"]
+
+def test_max_price_only_excludes_unpriced_products():
+    assert SearchFilters.create(max_price=10000).to_where() == {
+        "$and": [{"price": {"$gt": 0.0}}, {"price": {"$lte": 10000.0}}]
+    }
+
+def test_zero_min_price_excludes_unpriced_products():
+    assert SearchFilters.create(min_price=0).to_where() == {"price": {"$gt": 0.0}}
+
+def test_zero_min_price_with_max_price_has_no_redundant_clause():
+    assert SearchFilters.create(min_price=0, max_price=5000).to_where() == {
+        "$and": [{"price": {"$gt": 0.0}}, {"price": {"$lte": 5000.0}}]
+    }
+
+def test_positive_min_price_needs_no_extra_clause():
+    assert SearchFilters.create(min_price=5000).to_where() == {"price": {"$gte": 5000.0}}
+
+def test_no_filters_is_no_where_clause():
+    assert SearchFilters.create().to_where() is None
+
+def test_text_filters_are_normalized():
+    assert SearchFilters.create(category="  Living   ROOM ", brand="Furlenco", availability="In stock").to_where() == {
+        "$and": [{"category_key": "living room"}, {"brand_key": "furlenco"}, {"availability_key": "available"}]
+    }
+
+def test_bare_available_is_not_a_filter():
+    text, filters = parse_query("is this bed available for rent")
+    assert filters.availability is None
+    assert text == "is this bed available for rent"
+
+def test_explicit_stock_phrases_are_filters():
+    for query in ("sofa in stock", "sofa in-stock", "sofa available now"):
+        text, filters = parse_query(query)
+        assert filters.availability == "available"
+        assert text == "sofa"
+
+def test_max_price_is_parsed_and_removed():
+    text, filters = parse_query("sofa under 10,000")
+    assert (text, filters.max_price, filters.min_price) == ("sofa", 10000.0, None)
+
+def test_price_range_with_units():
+    text, filters = parse_query("bed between 5k and 1.5 lakh")
+    assert (text, filters.min_price, filters.max_price) == ("bed", 5000.0, 150000.0)
+
+def test_small_bare_numbers_are_not_prices():
+    text, filters = parse_query("wardrobe with more than 3 drawers")
+    assert filters.is_empty
+    assert text == "wardrobe with more than 3 drawers"
+
+def test_longest_category_wins_and_stays_in_text():
+    text, filters = parse_query("Furlenco living room sofa", categories=CATEGORIES, brands=BRANDS)
+    assert (filters.category, filters.brand) == ("living room", "furlenco")
+    assert text == "furlenco living room sofa"
@@ -17,6 +17,15 @@ export const productService = {
     return response.data;
   },
 
+  // Get one page of products using cursor pagination. Pass the returned
+  // nextCursor back in to fetch the following page (null on the last page).
+  getProductsPage: async (cursor = null, limit = 100) => {
+    const params = { limit };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/products', { params });
+    return { products: response.data, nextCursor: response.headers['x-next-cursor'] || null };
+  },
+
   // Get product by ID
   getProduct: async (id) => {
     const response = await api.get(`/products/${id}`);
@@ -30,8 +39,15 @@ export const productService = {
   },
 
   // Search products
-  searchProducts: async (query) => {
-    const response = await api.get(`/chat/search/${encodeURIComponent(query)}`);
+  // filters: { min_price, max_price, category, brand, availability } (all optional)
+  searchProducts: async (query, filters = {}) => {
+    const response = await api.get(`/chat/search/${encodeURIComponent(query)}`, { params: filters });
+    return response.data;
+  },
+
+  // Search many queries in one request; returns { results: [{ query, products }] }
+  searchProductsBatch: async (queries, limit = 10, filters = {}) => {
+    const response = await api.post('/chat/search/batch', { queries, limit, ...filters });
     return response.data;
   },
 };
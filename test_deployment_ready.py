@@ -100,6 +100,55 @@ def test_start_script():
         print(f"⚠️  WARNING: start.sh is not executable (will be fixed in Dockerfile)")
         return True  # Non-fatal, Dockerfile will fix this
 
+def test_seed_then_scrape():
+    """Test that seeding and scraping the fallback catalog agree: no duplicates, and repeating either changes nothing."""
+    print(f"\n🌱 Checking Seed + Scrape\n")
+    
+    import tempfile
+    sys.path.insert(0, str(Path(__file__).parent / "backend"))
+    from sqlalchemy.orm import sessionmaker
+    from seed_db import seed_database
+    from app.database import create_db_engine
+    from app.models.product import Product
+    from app.scraper import get_fallback_furlenco_products
+    from app.services.product_ingest import bulk_upsert_products
+    
+    database_url = f"sqlite:///{tempfile.mkdtemp()}/seed_then_scrape.db"
+    session = sessionmaker(bind=create_db_engine(database_url))()
+    
+    def scrape():
+        # Same ingest call as the scraping endpoint, which matches products on their URL
+        return bulk_upsert_products(session, get_fallback_furlenco_products(), key="product_url")
+    
+    def snapshot():
+        session.expire_all()
+        return [product.to_dict() for product in session.query(Product).order_by(Product.id)]
+    
+    try:
+        if not seed_database(database_url):
+            print(f"❌ FAIL: Seeding failed")
+            return False
+        seeded = snapshot()
+        
+        # seed -> scrape -> seed -> scrape, every step after the first is a no-op
+        for step, run in (("scrape", scrape), ("reseed", lambda: seed_database(database_url)), ("rescrape", scrape)):
+            stats = run()
+            if isinstance(stats, dict) and (stats["inserted"] or stats["updated"]):
+                print(f"❌ FAIL: {step} wrote {stats['inserted']} new and {stats['updated']} changed products")
+                return False
+            if snapshot() != seeded:
+                print(f"❌ FAIL: {step} changed the seeded products")
+                return False
+    finally:
+        session.close()
+    
+    if len(seeded) != 6:
+        print(f"❌ FAIL: Expected 6 products after seed + scrape, found {len(seeded)}")
+        return False
+    
+    print(f"✅ Seed + scrape leaves the {len(seeded)} seeded products unchanged")
+    return True
+
 def main():
     print("=" * 60)
     print("🚀 Neusearch Deployment Readiness Test")
@@ -109,7 +158,8 @@ def main():
     tests = [
         ("Fallback Data", test_fallback_data),
         ("Config Files", test_config_files),
-        ("Start Script", test_start_script)
+        ("Start Script", test_start_script),
+        ("Seed + Scrape", test_seed_then_scrape)
     ]
     
     results = []